@@ -0,0 +1,58 @@
+"""Micro-benchmark: events/sec of the legacy BeautifulSoup parser vs the lxml parser
+
+Usage: python benchmarks/bench_parse.py [--iterations N]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Parsing needs no event store; without this, importing main creates data/events.db in the working directory
+os.environ['EVENT_STORE_PATH'] = ''
+
+import legacy_parser
+from fixtures import FIXTURES, PAGES_DIR, write_fixtures
+from main import scraper
+
+def comparable(events):
+    return [{k: v for k, v in event.items() if k != 'scraped_at'} for event in events]
+
+def measure(parse, page_source, iterations):
+    """Return (events per parse, events/sec) over the given number of parses"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            events = parse(page_source)
+        elapsed = time.perf_counter() - start
+    return len(events), len(events) * iterations / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=20)
+    args = parser.parse_args()
+
+    if not all(os.path.exists(os.path.join(PAGES_DIR, name)) for name in FIXTURES):
+        write_fixtures()
+
+    print(f"{'fixture':<26} {'events':>6} {'before ev/s':>12} {'after ev/s':>12} {'speedup':>8}")
+    for name in FIXTURES:
+        with open(os.path.join(PAGES_DIR, name)) as f:
+            page_source = f.read()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            before_events = legacy_parser.parse_calendar_data(scraper, page_source, '2025', '10')
+            after_events = scraper.parse_calendar_data(page_source, '2025', '10')
+        if comparable(before_events) != comparable(after_events):
+            print(f"{name}: parsers disagree ({len(before_events)} vs {len(after_events)} events)")
+            sys.exit(1)
+
+        count, before = measure(lambda html: legacy_parser.parse_calendar_data(scraper, html, '2025', '10'), page_source, args.iterations)
+        _, after = measure(lambda html: scraper.parse_calendar_data(html, '2025', '10'), page_source, args.iterations)
+        print(f"{name:<26} {count:>6} {before:>12,.0f} {after:>12,.0f} {after / before:>7.1f}x")
+
+if __name__ == '__main__':
+    main()
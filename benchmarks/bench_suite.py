@@ -0,0 +1,249 @@
+"""Offline benchmark suite: parser, filters and the /calendar route against recorded week pages
+
+The /calendar scenarios run the real Flask route with the HTTP fast path
+pointed at a local stand-in server that replays the fixture pages, so no
+browser or network access is needed.
+
+Usage: python benchmarks/bench_suite.py [--concurrency 1,10,100] [--ops 200] [--output results.json]
+"""
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime
+from urllib.parse import parse_qs, urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Keep the app under test self-contained: no event store, no background refreshes
+os.environ['EVENT_STORE_PATH'] = ''
+os.environ['PREWARM_ENABLED'] = '0'
+os.environ['HTTP_FAST_PATH'] = '1'
+# Warm-up requests coalesce onto one scrape per week; don't let the waiter cap turn them into 503s
+os.environ['SCRAPE_MAX_WAITERS'] = '1000'
+
+from fixtures import FIXTURES, PAGES_DIR, build_week_page, write_fixtures
+import main
+
+FILTERS = [
+    ('USD', None),
+    ('USD,EUR,GBP', None),
+    (None, 'high'),
+    ('EUR,JPY', 'high,medium')
+]
+
+def load_pages():
+    if not all(os.path.exists(os.path.join(PAGES_DIR, name)) for name in FIXTURES):
+        write_fixtures()
+    pages = {}
+    for name in FIXTURES:
+        with open(os.path.join(PAGES_DIR, name)) as f:
+            pages[name] = f.read()
+    return pages
+
+def start_fixture_server(pages, delay=0.0):
+    """Serve the requested week in a fixture's layout, choosing the fixture by week number so every layout is exercised"""
+    # The nested layout only parses its first day, so it can never pass for a whole week
+    names = sorted(name for name in pages if 'wrapper' not in FIXTURES[name])
+    rendered = {}
+
+    def render(week):
+        # The fast path only accepts a page whose days cover the requested week
+        if week not in rendered:
+            year, number = (int(part) for part in week.split('-W'))
+            options = dict(FIXTURES[names[number % len(names)]], start=date.fromisocalendar(year, number, 1))
+            rendered[week] = build_week_page(**options).encode()
+        return rendered[week]
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            week = parse_qs(urlparse(self.path).query).get('week', ['2025-W01'])[0]
+            body = render(week)
+            if delay:
+                time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def run_threads(concurrency, ops, make_op):
+    """Run ops calls of make_op(worker)(i) spread over concurrency threads; return (latencies, errors, elapsed)"""
+    latencies = []
+    lock = threading.Lock()
+    counter = iter(range(ops))
+    errors = []
+
+    def worker(worker_id):
+        op = make_op(worker_id)
+        local = []
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            try:
+                op(i)
+            except Exception as e:
+                errors.append(str(e))
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+def reset_cache():
+    main.scraper.cache = main.WeekCache()
+
+def run_scenario(name, concurrency, ops, make_op, memory_ops):
+    """Time a scenario, then replay a shorter run under tracemalloc to measure its peak memory"""
+    reset_cache()
+    latencies, errors, elapsed = run_threads(concurrency, ops, make_op)
+
+    # tracemalloc slows allocation-heavy code several times over, so it never overlaps the timed run
+    reset_cache()
+    tracemalloc.start()
+    run_threads(concurrency, max(memory_ops, concurrency), make_op)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'concurrency': concurrency,
+        'ops': len(latencies),
+        'errors': len(errors),
+        'throughput_ops_per_sec': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0,
+        'peak_memory_bytes': peak
+    }
+
+def scenarios(pages, server_url):
+    scraper = main.scraper
+    parsed = {name: scraper.parse_calendar_data(html, '2025', '10') for name, html in pages.items()}
+
+    for fixture, html in pages.items():
+        yield f'parse[{fixture}]', lambda worker, html=html: (lambda i: scraper.parse_calendar_data(html, '2025', '10'))
+
+    all_events = [event for events in parsed.values() for event in events]
+
+    def filter_op(worker):
+        def op(i):
+            currency_filter, impact_filter = FILTERS[i % len(FILTERS)]
+            scraper.apply_filters(all_events, currency_filter, impact_filter)
+        return op
+    yield 'apply_filters', filter_op
+
+    batch = main.EventBatch(all_events)
+
+    def batch_filter_op(worker):
+        def op(i):
+            currency_filter, impact_filter = FILTERS[i % len(FILTERS)]
+            scraper.apply_filters(batch, currency_filter, impact_filter)
+        return op
+    yield 'apply_filters[EventBatch]', batch_filter_op
+
+    scraper.http_fetcher = main.HttpCalendarFetcher(server_url)
+
+    def route_cold(worker):
+        client = main.app.test_client()
+
+        def op(i):
+            # A distinct past week per call, so every request misses the cache
+            year, week = 2000 + (worker * 1000 + i) // 52 % 100, 1 + (worker * 1000 + i) % 52
+            response = client.get(f'/calendar?year={year}&week={week}')
+            if response.status_code != 200:
+                raise RuntimeError(f'status {response.status_code}')
+        return op
+    yield 'calendar_route_cold', route_cold
+
+    def route_warm(worker):
+        client = main.app.test_client()
+
+        def op(i):
+            currency_filter, _ = FILTERS[i % len(FILTERS)]
+            query = f'&currency={currency_filter}' if currency_filter else ''
+            response = client.get(f'/calendar?year=2025&week=10{query}')
+            if response.status_code != 200:
+                raise RuntimeError(f'status {response.status_code}')
+        return op
+    yield 'calendar_route_warm', route_warm
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--concurrency', default='1,10,100', help='comma-separated client counts')
+    parser.add_argument('--ops', type=int, default=200, help='operations per scenario and concurrency level')
+    parser.add_argument('--memory-ops', type=int, default=20, help='operations replayed under tracemalloc for peak memory')
+    parser.add_argument('--server-delay', type=float, default=0.0, help='seconds the stand-in server waits per page')
+    parser.add_argument('--output', help='write machine-readable results to this JSON file')
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    pages = load_pages()
+    server = start_fixture_server(pages, args.server_delay)
+    server_url = f'http://127.0.0.1:{server.server_port}/economic-calendar'
+
+    results = []
+    print(f"{'scenario':<36} {'clients':>7} {'ops/s':>10} {'p50 ms':>9} {'p99 ms':>9} {'peak MB':>8} {'errors':>6}")
+    with contextlib.redirect_stdout(io.StringIO()) as quiet:
+        all_scenarios = list(scenarios(pages, server_url))
+    for name, make_op in all_scenarios:
+        for level in levels:
+            with contextlib.redirect_stdout(quiet):
+                result = run_scenario(name, level, args.ops, make_op, args.memory_ops)
+            quiet.seek(0)
+            quiet.truncate()
+            results.append(result)
+            print(f"{name:<36} {level:>7} {result['throughput_ops_per_sec']:>10,.0f} {result['p50_ms']:>9.2f} "
+                  f"{result['p99_ms']:>9.2f} {result['peak_memory_bytes'] / 1e6:>8.1f} {result['errors']:>6}")
+    server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'ops': args.ops,
+                'memory_ops': args.memory_ops,
+                'results': results
+            }, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == '__main__':
+    main_cli()
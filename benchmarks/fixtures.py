@@ -0,0 +1,136 @@
+"""Generate offline week pages that mirror the BabyPips calendar markup
+
+The pages are deterministic reconstructions of the layouts the scraper
+understands, padded with the navigation, script and footer noise of a real
+page so parse benchmarks see a realistic document size.
+
+Usage: python benchmarks/fixtures.py
+"""
+import os
+import random
+from datetime import date, timedelta
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pages')
+
+CURRENCIES = ['USD', 'EUR', 'GBP', 'JPY', 'AUD', 'NZD', 'CAD', 'CHF', 'CNY']
+IMPACTS = ['high', 'med', 'low']
+EVENT_NAMES = [
+    'Non-Farm Payrolls', 'CPI m/m', 'Core CPI y/y', 'Unemployment Rate', 'Retail Sales m/m',
+    'GDP q/q', 'Manufacturing PMI', 'Services PMI', 'Trade Balance', 'Interest Rate Decision',
+    'Building Permits', 'Consumer Confidence', 'PPI m/m', 'Crude Oil Inventories', 'ZEW Economic Sentiment'
+]
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+MODULE_CLASSES = {
+    'day': 'Section-module__container___WUPgM Table-module__day___As54H',
+    'month': 'Table-module__month___PGbXI',
+    'day_number': 'Table-module__dayNumber___dyJpm',
+    'weekday': 'Table-module__weekday___p3Buh',
+    'time': 'Table-module__time___IHBtp',
+    'currency': 'Table-module__currency___gSAJ5',
+    'name': 'Table-module__name___FugPe',
+    'impact': 'Table-module__impact___kYuei',
+    'actual': 'Table-module__actual___kzVNq',
+    'forecast': 'Table-module__forecast___WchYX',
+    'previous': 'Table-module__previous___F0PHu'
+}
+
+def page_noise(rng, blocks=40):
+    """Navigation, inline scripts and footer markup surrounding the calendar"""
+    nav = ''.join(f'<li class="Nav-module__item___x{n}"><a href="/learn/{n}">Lesson {n}</a></li>' for n in range(blocks))
+    script = '<script>window.__STATE__ = {' + ','.join(f'"k{n}": {rng.random():.6f}' for n in range(blocks * 20)) + '};</script>'
+    footer = ''.join(f'<p class="Footer-module__text___q{n}">Risk disclaimer paragraph {n}. ' + 'Trading involves risk. ' * 8 + '</p>' for n in range(blocks))
+    return f'<header><nav><ul>{nav}</ul></nav></header>{script}', f'<footer>{footer}</footer>'
+
+def event_cells(rng):
+    previous = f'{rng.uniform(-5, 5):.1f}%'
+    return [
+        f'{rng.randint(0, 23):02d}:{rng.choice(["00", "15", "30", "45"])}',
+        rng.choice(CURRENCIES),
+        rng.choice(EVENT_NAMES),
+        rng.choice(IMPACTS),
+        rng.choice(['', f'{rng.uniform(-5, 5):.1f}%']),
+        f'{rng.uniform(-5, 5):.1f}%',
+        previous
+    ]
+
+def module_day(rng, month, day, events_per_day):
+    c = MODULE_CLASSES
+    rows = []
+    for _ in range(events_per_day):
+        time_val, currency, name, impact, actual, forecast, previous = event_cells(rng)
+        rows.append(
+            f'<tr><td class="{c["time"]}">{time_val}</td>'
+            f'<td class="{c["currency"]}"><span class="Flag-module__flag___a1">{currency}</span></td>'
+            f'<td class="{c["name"]}"><a href="/economic-calendar/{name.lower().replace(" ", "-")}">{name}</a></td>'
+            f'<td class="{c["impact"]}"><span class="Impact-module__{impact}___z9">{impact}</span></td>'
+            f'<td class="{c["actual"]}">{actual}</td>'
+            f'<td class="{c["forecast"]}">{forecast}</td>'
+            f'<td class="{c["previous"]}">{previous}</td></tr>'
+        )
+    return (
+        f'<div class="{c["day"]}"><table><thead><tr><td class="{c["weekday"]}">'
+        f'<div class="{c["month"]}">{month}</div><div class="{c["day_number"]}">{day}</div></td></tr></thead>'
+        f'<tbody>{"".join(rows)}</tbody></table></div>'
+    )
+
+def fallback_day(rng, month, day, events_per_day):
+    """Day block without CSS-module classes: a 'day' section with plain positional cells"""
+    rows = ''.join('<tr>' + ''.join(f'<td>{cell}</td>' for cell in event_cells(rng)) + '</tr>' for _ in range(events_per_day))
+    return f'<section class="calendar-day"><h3>{month}</h3><h4>{day}</h4><table><tbody>{rows}</tbody></table></section>'
+
+def fallback_div_day(rng, month, day, events_per_day):
+    """Day block as a 'day' div whose header text carries the date and rows have no cell classes"""
+    rows = ''.join('<tr>' + ''.join(f'<td><span>{cell}</span></td>' for cell in event_cells(rng)) + '</tr>' for _ in range(events_per_day))
+    return f'<div class="EconomicDayBlock"><p><span>{month}</span> <span>{day}</span></p><table><tbody>{rows}</tbody></table></div>'
+
+LAYOUTS = {
+    'module': module_day,
+    'fallback': fallback_day,
+    'fallback_div': fallback_div_day
+}
+
+def controls(timezone):
+    """Calendar controls at the positions the scraper's timezone and week button XPaths expect"""
+    options = ''.join(f'<li><div>GMT{offset:+d}</div></li>' for offset in range(-12, 15))
+    return (
+        '<div><div><div>Economic Calendar</div><div>'
+        f'<div><button>{timezone}</button><ol>{options}</ol></div>'
+        '<div><button>Week</button><button>Day</button></div>'
+        '</div></div></div>'
+    )
+
+def build_week_page(layout='module', start=date(2025, 3, 3), days=5, events_per_day=20, seed=0, wrapper=None,
+                    timezone='GMT+0'):
+    """Return the HTML of one synthetic calendar week starting on start, with the day blocks optionally inside a div of class wrapper"""
+    rng = random.Random(seed)
+    header, footer = page_noise(rng)
+    day_html = ''.join(
+        LAYOUTS[layout](rng, MONTHS[day.month - 1], str(day.day), events_per_day)
+        for day in (start + timedelta(days=offset) for offset in range(days))
+    )
+    if wrapper:
+        day_html = f'<div class="{wrapper}">{day_html}</div>'
+    return (
+        '<!DOCTYPE html><html><head><title>Forex Economic Calendar | BabyPips.com</title></head>'
+        f'<body><div id="__next"><div>{header}</div><div><section></section>'
+        f'<section><div><div>{controls(timezone)}<div>{day_html}</div></div></div></section></div>{footer}</div></body></html>'
+    )
+
+FIXTURES = {
+    'week_module.html': dict(layout='module', seed=1),
+    'week_module_busy.html': dict(layout='module', events_per_day=60, seed=2),
+    'week_fallback.html': dict(layout='fallback', seed=3),
+    'week_fallback_div.html': dict(layout='fallback_div', seed=4),
+    'week_fallback_nested.html': dict(layout='fallback', wrapper='calendar-days', seed=5)
+}
+
+def write_fixtures():
+    os.makedirs(PAGES_DIR, exist_ok=True)
+    for name, options in FIXTURES.items():
+        with open(os.path.join(PAGES_DIR, name), 'w') as f:
+            f.write(build_week_page(**options))
+        print(f"Wrote {name}")
+
+if __name__ == '__main__':
+    write_fixtures()
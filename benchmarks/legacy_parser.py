@@ -0,0 +1,73 @@
+"""BeautifulSoup parser as it shipped before the lxml rewrite, kept as a benchmark baseline"""
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+def parse_calendar_data(scraper, page_source, year, week):
+    soup = BeautifulSoup(page_source, 'html.parser')
+    events = []
+    blocks = soup.find_all('div', class_='Section-module__container___WUPgM Table-module__day___As54H')
+    if not blocks:
+        blocks = soup.find_all('div', class_=re.compile(r'day', re.I)) or \
+                 soup.find_all('section', class_=re.compile(r'day', re.I))
+    for block in blocks:
+        try:
+            month_elem = block.find('div', class_='Table-module__month___PGbXI')
+            day_elem = block.find('div', class_='Table-module__dayNumber___dyJpm')
+            if not month_elem or not day_elem:
+                month_elem = block.find(string=re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'))
+                day_elem = block.find(string=re.compile(r'\d{1,2}'))
+            month_name = month_elem.get_text() if hasattr(month_elem, 'get_text') else str(month_elem) if month_elem else 'Jan'
+            day_number = day_elem.get_text() if hasattr(day_elem, 'get_text') else str(day_elem) if day_elem else '1'
+            if week == '01' and month_name == 'Dec':
+                continue
+            month_num = scraper.months.get(month_name, '01')
+            event_rows = block.find_all('tr') if block.find('tbody') else []
+            if block.find('tbody'):
+                event_rows = block.find('tbody').find_all('tr')
+            for row in event_rows:
+                event = parse_event_row(scraper, row, year, month_num, day_number)
+                if event:
+                    events.append(event)
+        except Exception:
+            continue
+    return events
+
+def parse_event_row(scraper, row, year, month_num, day_number):
+    try:
+        time_elem = row.find('td', class_='Table-module__time___IHBtp')
+        currency_elem = row.find('td', class_='Table-module__currency___gSAJ5')
+        name_elem = row.find('td', class_='Table-module__name___FugPe')
+        impact_elem = row.find('td', class_='Table-module__impact___kYuei')
+        actual_elem = row.find('td', class_='Table-module__actual___kzVNq')
+        forecast_elem = row.find('td', class_='Table-module__forecast___WchYX')
+        previous_elem = row.find('td', class_='Table-module__previous___F0PHu')
+        if not time_elem:
+            cells = row.find_all('td')
+            if len(cells) >= 7:
+                time_elem, currency_elem, name_elem, impact_elem, actual_elem, forecast_elem, previous_elem = cells[:7]
+        time_val = time_elem.get_text(strip=True) if time_elem else ''
+        currency_val = currency_elem.get_text(strip=True) if currency_elem else ''
+        name_val = name_elem.get_text(strip=True) if name_elem else ''
+        impact_val = impact_elem.get_text(strip=True) if impact_elem else ''
+        actual_val = actual_elem.get_text(strip=True) if actual_elem else ''
+        forecast_val = forecast_elem.get_text(strip=True) if forecast_elem else ''
+        previous_val = previous_elem.get_text(strip=True) if previous_elem else ''
+        if not name_val or len(name_val) < 3:
+            return None
+        timestamp = scraper.calculate_timestamp(year, month_num, day_number, time_val)
+        return {
+            'date': f"{year}-{month_num}-{day_number.zfill(2)}",
+            'time': time_val,
+            'currency': currency_val,
+            'event_name': name_val,
+            'importance': scraper.normalize_impact(impact_val),
+            'actual': actual_val,
+            'forecast': forecast_val,
+            'previous': previous_val,
+            'timestamp': timestamp,
+            'scraped_at': datetime.now().isoformat()
+        }
+    except Exception:
+        return None
@@ -0,0 +1,24 @@
+# Production server settings: gunicorn -c gunicorn.conf.py main:app
+#
+# A single worker process keeps one driver pool, cache and scrape executor
+# shared by every request. Threads are cheap, so slow scrapes only tie up a
+# thread while /weeks, /health and cache hits are served alongside them.
+#
+# Every request that can block for long is capped, and is answered 503 with
+# Retry-After beyond its cap:
+#   SCRAPE_WORKERS + SCRAPE_QUEUE_DEPTH  requests leading an admitted scrape
+#   SCRAPE_MAX_WAITERS                   requests waiting on another's scrape
+#   RANGE_MAX_CONCURRENT                 /calendar/range streams
+#   SSE_MAX_STREAMS                      /calendar/changes/stream subscribers
+# Keep WEB_THREADS above their sum (2 + 8 + 8 + 2 + 8 = 28 by default) so a
+# few threads are always left for everything else.
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+workers = 1
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_THREADS', '32'))
+timeout = int(os.environ.get('WEB_TIMEOUT', '180'))
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
@@ -1,17 +1,1745 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request, stream_with_context
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from requests.adapters import HTTPAdapter
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import date, datetime, timedelta
+from itertools import chain
+from lxml import etree
+import lxml.html
+import argparse
+import atexit
+import bisect
+import gzip
+import heapq
+import json
+import math
+import os
+import random
 import re
+import requests
+import sqlite3
+import sys
+import threading
 import time
+import zlib
+
+# Optional snapshot formats; compressed JSON is always available
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 app = Flask(__name__)
 
+# Both known page layouts differ only in the index of the top-level wrapper div
+CONTROLS_XPATH = '/html/body/div[{root}]/div[2]/section[2]/div/div/div[1]/div/div[2]'
+WEEK_BUTTON_XPATHS = [CONTROLS_XPATH.format(root=root) + '/div[2]/button[1]' for root in (2, 1)]
+TIMEZONE_BUTTON_XPATHS = [CONTROLS_XPATH.format(root=root) + '/div[1]/button' for root in (2, 1)]
+TIMEZONE_OPTION_XPATHS = [CONTROLS_XPATH.format(root=root) + '/div[1]/ol/li[13]/div' for root in (2, 1)]
+TIMEZONE_BUTTONS = [etree.XPath(xpath) for xpath in TIMEZONE_BUTTON_XPATHS]
+
+# The 13th timezone option the Selenium path selects is GMT+0 in the site's offset-ordered
+# list (GMT-12 first); pages fetched without a browser must show times in the same zone
+CALENDAR_TZ_OFFSET = int(os.environ.get('CALENDAR_TZ_OFFSET', '0'))
+TIMEZONE_LABEL_RE = re.compile(r'(?:GMT|UTC)\s*(?:([+-])\s*(\d{1,2})(?::?(\d{2}))?)?', re.I)
+
+DOM_QUIET_MS = int(os.environ.get('DOM_QUIET_MS', '300'))
+DOM_SETTLE_MS = int(os.environ.get('DOM_SETTLE_MS', '1500'))
+
+# Installs a MutationObserver on first call and reports calendar readiness on every call
+READINESS_SCRIPT = """
+if (!window.__calendarObserver) {
+    window.__calendarLastMutation = performance.now();
+    window.__calendarObserver = new MutationObserver(function () {
+        window.__calendarLastMutation = performance.now();
+    });
+    window.__calendarObserver.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+return {
+    days: document.querySelectorAll('div[class*="Table-module__day___"]').length,
+    quiet: performance.now() - window.__calendarLastMutation
+};
+"""
+
+# Returns the outerHTML of the day block for a month name and day number, or null
+DAY_BLOCK_SCRIPT = """
+var month = arguments[0], day = arguments[1];
+var blocks = document.querySelectorAll('div[class*="Table-module__day___"]');
+for (var i = 0; i < blocks.length; i++) {
+    var monthCell = blocks[i].querySelector('div[class*="Table-module__month___"]');
+    var dayCell = blocks[i].querySelector('div[class*="Table-module__dayNumber___"]');
+    if (monthCell && dayCell && monthCell.textContent.trim() === month && String(parseInt(dayCell.textContent, 10)) === day) {
+        return blocks[i].outerHTML;
+    }
+}
+return null;
+"""
+
+# Non-essential resources dropped in lean-page mode: images, fonts, media, ads and analytics
+BLOCKED_URL_PATTERNS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+    '*.mp4', '*.webm', '*.mp3',
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*googlesyndication.com*',
+    '*adservice.google.com*', '*amazon-adsystem.com*', '*facebook.net*', '*connect.facebook.com*',
+    '*hotjar.com*', '*segment.com*', '*segment.io*', '*quantserve.com*', '*scorecardresearch.com*',
+    '*nr-data.net*', '*newrelic.com*', '*clarity.ms*', '*bing.com/bat*', '*twitter.com/i/adsct*'
+]
+
+# Bytes over the wire (cache hits count as 0) and load time of the current document
+PAGE_TIMING_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+var resources = performance.getEntriesByType('resource');
+var bytes = nav.transferSize || 0;
+for (var i = 0; i < resources.length; i++) { bytes += resources[i].transferSize || 0; }
+return {bytes: bytes, resources: resources.length, load_ms: (nav.loadEventEnd || nav.domContentLoadedEventEnd || performance.now()) - nav.startTime};
+"""
+
+def first_clickable(xpaths):
+    """Wait condition returning (index, element) for the first clickable xpath among several"""
+    def condition(driver):
+        for index, xpath in enumerate(xpaths):
+            try:
+                element = driver.find_element(By.XPATH, xpath)
+                if element.is_displayed() and element.is_enabled():
+                    return index, element
+            except (NoSuchElementException, StaleElementReferenceException):
+                continue
+        return False
+    return condition
+
+def calendar_ready(driver):
+    """Wait condition: day containers rendered and DOM quiet, or DOM settled without them"""
+    state = driver.execute_script(READINESS_SCRIPT)
+    if state['days'] > 0:
+        return state['quiet'] >= DOM_QUIET_MS
+    return state['quiet'] >= DOM_SETTLE_MS
+
+# Precompiled selectors for the CSS-module calendar layout and its fallbacks
+DAY_BLOCKS = etree.XPath('//div[contains(@class, "Table-module__day___")]')
+# Sections are only tried when no div matches, so a 'day' section nested in a 'days' div is not parsed twice
+FALLBACK_DAY_DIVS = etree.XPath('//div[re:test(@class, "day", "i")]', namespaces={'re': 'http://exslt.org/regular-expressions'})
+FALLBACK_DAY_SECTIONS = etree.XPath('//section[re:test(@class, "day", "i")]', namespaces={'re': 'http://exslt.org/regular-expressions'})
+MONTH_CELL = etree.XPath('.//div[contains(@class, "Table-module__month___")]')
+DAY_NUMBER_CELL = etree.XPath('.//div[contains(@class, "Table-module__dayNumber___")]')
+EVENT_ROWS = etree.XPath('(.//tbody)[1]//tr')
+MONTH_NAME_RE = re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)')
+DAY_NUMBER_RE = re.compile(r'\d{1,2}')
+
+# Event cell class prefix -> field, and the positional order used when classes are missing
+CELL_FIELDS = {
+    'Table-module__time': 'time',
+    'Table-module__currency': 'currency',
+    'Table-module__name': 'name',
+    'Table-module__impact': 'impact',
+    'Table-module__actual': 'actual',
+    'Table-module__forecast': 'forecast',
+    'Table-module__previous': 'previous'
+}
+CELL_ORDER = ('time', 'currency', 'name', 'impact', 'actual', 'forecast', 'previous')
+
+WEEK_SPEC_RE = re.compile(r'^(\d{4})-W(\d{1,2})$')
+
+def parse_week_spec(spec):
+    """Parse an ISO week like 2025-W01 into (year, week); raise ValueError if invalid"""
+    match = WEEK_SPEC_RE.match(spec or '')
+    if not match:
+        raise ValueError(f"Invalid week '{spec}', expected YYYY-Www")
+    year, week = int(match.group(1)), int(match.group(2))
+    date.fromisocalendar(year, week, 1)
+    return year, week
+
+def iter_weeks(start, end):
+    """List every (year, week) from start to end inclusive, crossing year boundaries"""
+    monday = date.fromisocalendar(start[0], start[1], 1)
+    last = date.fromisocalendar(end[0], end[1], 1)
+    weeks = []
+    while monday <= last:
+        year, week, _ = monday.isocalendar()
+        weeks.append((year, week))
+        monday += timedelta(weeks=1)
+    return weeks
+
+def covers_week(events, year, week):
+    """True if events come from a view of the whole week: every weekday present and no day outside it
+
+    The parser drops December days from week 01, so only weekdays in the ISO
+    year itself are required.
+    """
+    monday = date.fromisocalendar(int(year), int(week), 1)
+    days = [monday + timedelta(days=offset) for offset in range(7)]
+    in_week = {(day.month, day.day) for day in days}
+    required = {(day.month, day.day) for day in days[:5] if day.year == int(year)}
+    seen = set()
+    try:
+        for event in events:
+            _, month, day = event['date'].split('-')
+            seen.add((int(month), int(day)))
+    except ValueError:
+        return False
+    return seen <= in_week and required <= seen
+
+# Weeks relative to the current one that /weeks advertises and the pre-warmer keeps fresh
+WEEK_WINDOW = range(-2, 5)
+
+def week_window(current_date=None):
+    """List (offset, iso_year, iso_week, monday) for every week in WEEK_WINDOW"""
+    current_date = current_date or datetime.now()
+    weeks = []
+    for offset in WEEK_WINDOW:
+        target_date = current_date + timedelta(weeks=offset)
+        year, week_num, _ = target_date.isocalendar()
+        monday = target_date - timedelta(days=target_date.weekday())
+        weeks.append((offset, year, week_num, monday))
+    return weeks
+
+def timezone_offset(label):
+    """Minutes east of UTC named by a label like "GMT+0", "UTC" or "(GMT-04:00) New York"; None if it names none"""
+    match = TIMEZONE_LABEL_RE.search(label or '')
+    if not match:
+        return None
+    sign, hours, minutes = match.groups()
+    offset = int(hours or 0) * 60 + int(minutes or 0)
+    return -offset if sign == '-' else offset
+
+def page_timezone_offset(tree):
+    """Offset shown on the calendar's timezone button, or None if the page has no such button"""
+    for xpath in TIMEZONE_BUTTONS:
+        button = first_or_none(xpath(tree))
+        if button is not None:
+            return timezone_offset(button.text_content())
+    return None
+
+def first_or_none(elements):
+    return elements[0] if elements else None
+
+def first_text_matching(element, pattern):
+    """First text node under element matching pattern, like BeautifulSoup's find(string=...)"""
+    for text in element.itertext():
+        if pattern.search(text):
+            return text
+    return None
+
+def cell_text(cell):
+    """Concatenate a cell's text nodes, each stripped, like get_text(strip=True)"""
+    return ''.join(text.strip() for text in cell.itertext())
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+class Metrics:
+    """In-process counters, gauges and histograms rendered in Prometheus text format"""
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._buckets = {}
+        self._counters = {}
+        self._histograms = {}
+        self._gauges = {}
+
+    def describe(self, name, kind, help_text, buckets=None):
+        self._help[name] = (kind, help_text)
+        if buckets:
+            self._buckets[name] = tuple(buckets)
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                bounds = self._buckets.get(name, self.BUCKETS)
+                histogram = self._histograms[key] = [[0] * len(bounds), 0.0, 0, bounds]
+            for i, bound in enumerate(histogram[3]):
+                if value <= bound:
+                    histogram[0][i] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    @contextmanager
+    def span(self, phase, **labels):
+        """Time a block of work into the scrape_phase_seconds histogram"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe('scrape_phase_seconds', time.perf_counter() - start, phase=phase, **labels)
+
+    def gauge(self, name, fn):
+        """Register a callable sampled at render time; it returns a number or a {labels: value} dict"""
+        self._gauges[name] = fn
+
+    def render(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: ([*h[0]], h[1], h[2], h[3]) for key, h in self._histograms.items()}
+        
+        lines = []
+        described = set()
+        
+        def header(name, default_kind):
+            if name in described:
+                return
+            described.add(name)
+            kind, help_text = self._help.get(name, (default_kind, ''))
+            if help_text:
+                lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+        
+        for (name, labels), value in sorted(counters.items()):
+            header(name, 'counter')
+            lines.append(f'{name}{format_labels(labels)} {value}')
+        
+        for (name, labels), (buckets, total, count, bounds) in sorted(histograms.items()):
+            header(name, 'histogram')
+            for bound, bucket_count in zip(bounds, buckets):
+                lines.append(f'{name}_bucket{format_labels(labels + (("le", bound),))} {bucket_count}')
+            lines.append(f'{name}_bucket{format_labels(labels + (("le", "+Inf"),))} {count}')
+            lines.append(f'{name}_sum{format_labels(labels)} {total}')
+            lines.append(f'{name}_count{format_labels(labels)} {count}')
+        
+        for name, fn in sorted(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception as e:
+                print(f"Error sampling gauge {name}: {str(e)}")
+                continue
+            header(name, 'gauge')
+            samples = value.items() if isinstance(value, dict) else [((), value)]
+            for labels, sample in samples:
+                lines.append(f'{name}{format_labels(labels)} {sample}')
+        
+        return '\n'.join(lines) + '\n'
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (f'{k}="{str(v).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for k, v in labels)
+    return '{' + ','.join(escaped) + '}'
+
+metrics = Metrics()
+metrics.describe('scrape_phase_seconds', 'histogram', 'Wall time spent in each scrape phase')
+metrics.describe('http_request_duration_seconds', 'histogram', 'API request latency by endpoint')
+metrics.describe('scrape_attempts_total', 'counter', 'Selenium scrape attempts by outcome')
+metrics.describe('scrape_retries_total', 'counter', 'Selenium scrape attempts after the first')
+metrics.describe('week_loads_total', 'counter', 'Weeks loaded by source')
+metrics.describe('fallback_selector_hits_total', 'counter', 'Times a fallback selector was needed, by kind')
+metrics.describe('cache_requests_total', 'counter', 'Week cache lookups by result')
+metrics.describe('events_parsed_total', 'counter', 'Events produced by the parser')
+metrics.describe('scrape_rejections_total', 'counter', 'Scrapes rejected because the scrape queue was full')
+metrics.describe('change_feed_events_total', 'counter', 'Events logged to the change feed')
+metrics.describe('release_watch_polls_total', 'counter', 'Day-block re-reads by the release watcher')
+metrics.describe('release_detection_delay_seconds', 'histogram', 'Delay between scheduled release time and the actual being seen')
+metrics.describe('page_bytes_transferred_total', 'counter', 'Bytes transferred by Selenium page loads, by lean/full mode')
+metrics.describe('page_transfer_bytes', 'histogram', 'Bytes transferred per Selenium page load, by lean/full mode',
+                 buckets=(50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6, 25e6))
+metrics.describe('page_load_seconds', 'histogram', 'Browser-reported page load time, by lean/full mode')
+metrics.describe('http_fast_path_fallbacks_total', 'counter', 'HTTP fast path results that fell back to Selenium, by reason')
+
+def get_process_tree_rss(pid):
+    """Return resident memory in bytes of a process and all its descendants (Linux only)"""
+    total = 0
+    pending = [pid]
+    seen = set()
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f'/proc/{current}/status') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+            task_dir = f'/proc/{current}/task'
+            for tid in os.listdir(task_dir):
+                with open(f'{task_dir}/{tid}/children') as f:
+                    pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+    return total
+
+class PooledDriver:
+    """A webdriver checked out of the pool plus its usage bookkeeping"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.pages = 0
+
+    def rss(self):
+        """Resident memory of chromedriver and its Chrome children"""
+        try:
+            return get_process_tree_rss(self.driver.service.process.pid)
+        except Exception:
+            return 0
+
+class DriverPool:
+    """Bounded pool of warm headless Chrome drivers with recycling and idle reaping"""
+    def __init__(self, factory, max_size=2, max_pages=50, max_rss_mb=1024, idle_timeout=300, checkout_timeout=60,
+                 on_quit=None):
+        self.factory = factory
+        self.on_quit = on_quit
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.idle_timeout = idle_timeout
+        self.checkout_timeout = checkout_timeout
+        self._idle = []
+        self._live = set()
+        self._in_use = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.recycled = 0
+        self.last_error = None
+        self._reaper = threading.Thread(target=self._reap_loop, name='driver-pool-reaper', daemon=True)
+        self._reaper.start()
+
+    def _total(self):
+        return len(self._idle) + self._in_use
+
+    def checkout(self, timeout=None):
+        """Borrow a healthy driver, starting a new one if the pool has room"""
+        deadline = time.monotonic() + (self.checkout_timeout if timeout is None else timeout)
+        while True:
+            with self._cond:
+                while not self._idle and self._total() >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if self._closed or remaining <= 0:
+                        print("Driver pool exhausted, checkout timed out")
+                        return None
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return None
+                pooled = self._idle.pop() if self._idle else None
+                self._in_use += 1
+
+            if pooled is None:
+                try:
+                    driver = self.factory()
+                except Exception as e:
+                    print(f"Driver factory failed: {str(e)}")
+                    driver = None
+                    self.last_error = f'Driver initialization failed: {str(e)}'
+                else:
+                    if not driver:
+                        self.last_error = 'Driver initialization failed'
+                if not driver:
+                    self._release_slot()
+                    return None
+                self.created += 1
+                self.last_error = None
+                pooled = PooledDriver(driver)
+                with self._cond:
+                    self._live.add(pooled)
+                return pooled
+
+            if self._is_healthy(pooled):
+                return pooled
+
+            print("Pooled driver failed health probe, replacing")
+            self._quit(pooled)
+            self._release_slot()
+
+    def checkin(self, pooled, discard=False):
+        """Return a driver to the pool, recycling it if it is worn out or broken"""
+        pooled.pages += 1
+        pooled.last_used = time.monotonic()
+
+        if not discard:
+            if pooled.pages >= self.max_pages:
+                print(f"Recycling driver after {pooled.pages} pages")
+                discard = True
+            elif self.max_rss and pooled.rss() > self.max_rss:
+                print("Recycling driver over memory ceiling")
+                discard = True
+
+        if not discard:
+            try:
+                pooled.driver.get('about:blank')
+            except Exception:
+                discard = True
+
+        if discard or self._closed:
+            self.recycled += 1
+            self._quit(pooled)
+            self._release_slot()
+            return
+
+        with self._cond:
+            self._in_use -= 1
+            self._idle.append(pooled)
+            self._cond.notify()
+
+    def stats(self):
+        """Snapshot of pool occupancy and lifetime counters"""
+        with self._cond:
+            idle = list(self._idle)
+            in_use = self._in_use
+        return {
+            'max_size': self.max_size,
+            'idle': len(idle),
+            'in_use': in_use,
+            'created': self.created,
+            'recycled': self.recycled,
+            'rss_bytes': self.rss(),
+            'last_error': self.last_error
+        }
+
+    def close(self):
+        """Quit every idle driver and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for pooled in idle:
+            self._quit(pooled)
+
+    def _is_healthy(self, pooled):
+        try:
+            return pooled.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def _release_slot(self):
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify()
+
+    def rss(self):
+        """Resident memory of every live driver's Chrome process tree"""
+        with self._cond:
+            live = list(self._live)
+        return sum(p.rss() for p in live)
+
+    def _quit(self, pooled):
+        with self._cond:
+            self._live.discard(pooled)
+        try:
+            pooled.driver.quit()
+        except:
+            pass
+        if self.on_quit:
+            self.on_quit(pooled.driver)
+
+    def _reap_loop(self):
+        interval = max(1, min(30, self.idle_timeout / 2))
+        while not self._closed:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._cond:
+                expired = [p for p in self._idle if now - p.last_used > self.idle_timeout]
+                self._idle = [p for p in self._idle if p not in expired]
+                if expired:
+                    self._cond.notify_all()
+            for pooled in expired:
+                print("Reaping idle driver")
+                self.recycled += 1
+                self._quit(pooled)
+
+class Vocabulary:
+    """Interns repeated strings as small integer codes shared across event batches"""
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+        self._lock = threading.Lock()
+
+    def code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def matching(self, predicate):
+        """Codes of every interned value for which predicate(value) is true"""
+        return {code for code, value in enumerate(list(self.values)) if predicate(value)}
+
+CURRENCY_CODES = Vocabulary()
+IMPORTANCE_CODES = Vocabulary()
+
+class EventBatch:
+    """Compact columnar form of a list of events with index-backed filtering
+
+    Currency and importance are interned codes with per-code posting lists,
+    timestamps are 64-bit integers and the (normally single) scraped_at value
+    is stored once per batch. Iterating or calling to_dicts() yields events in
+    their original order and JSON shape.
+    """
+    __slots__ = ('dates', 'times', 'names', 'actuals', 'forecasts', 'previous', 'currencies',
+                 'importances', 'timestamps', 'scraped_at_values', 'scraped_at_codes',
+                 'currency_postings', 'importance_postings')
+
+    def __init__(self, events):
+        self.dates, self.times, self.names = [], [], []
+        self.actuals, self.forecasts, self.previous = [], [], []
+        self.currencies = array('H')
+        self.importances = array('H')
+        self.timestamps = array('q')
+        self.scraped_at_values = []
+        self.scraped_at_codes = array('H')
+        self.currency_postings = {}
+        self.importance_postings = {}
+        scraped_at_index = {}
+        
+        for i, event in enumerate(events):
+            self.dates.append(sys.intern(event['date']))
+            self.times.append(sys.intern(event['time']))
+            self.names.append(sys.intern(event['event_name']))
+            self.actuals.append(event['actual'])
+            self.forecasts.append(event['forecast'])
+            self.previous.append(event['previous'])
+            self.timestamps.append(int(event['timestamp']))
+            
+            currency = CURRENCY_CODES.code(event['currency'])
+            self.currencies.append(currency)
+            self.currency_postings.setdefault(currency, array('I')).append(i)
+            
+            importance = IMPORTANCE_CODES.code(event['importance'])
+            self.importances.append(importance)
+            self.importance_postings.setdefault(importance, array('I')).append(i)
+            
+            scraped_at = event.get('scraped_at', '')
+            if scraped_at not in scraped_at_index:
+                scraped_at_index[scraped_at] = len(self.scraped_at_values)
+                self.scraped_at_values.append(scraped_at)
+            self.scraped_at_codes.append(scraped_at_index[scraped_at])
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        return iter(self.to_dicts())
+
+    def select(self, currency_filter=None, impact_filter=None, start_ts=None, end_ts=None):
+        """Indices of events matching the /calendar filters and start_ts <= timestamp < end_ts
+
+        Currency filters keep the substring semantics of apply_filters, resolved
+        once against the interned vocabulary instead of against every event.
+        """
+        selected = None
+        if currency_filter:
+            wanted = [c.upper().strip() for c in currency_filter.split(',')]
+            codes = CURRENCY_CODES.matching(lambda value: any(c in value.upper() for c in wanted))
+            selected = self._postings(self.currency_postings, codes)
+        if impact_filter:
+            wanted = {i.lower().strip() for i in impact_filter.split(',')}
+            codes = IMPORTANCE_CODES.matching(lambda value: value.lower() in wanted)
+            matches = self._postings(self.importance_postings, codes)
+            selected = matches if selected is None else sorted(set(selected).intersection(matches))
+        if selected is None:
+            selected = range(len(self))
+        if start_ts is not None or end_ts is not None:
+            low = start_ts if start_ts is not None else -2 ** 63
+            high = end_ts if end_ts is not None else 2 ** 63 - 1
+            timestamps = self.timestamps
+            selected = [i for i in selected if low <= timestamps[i] < high]
+        return selected
+
+    def to_dicts(self, indices=None):
+        """Events at indices (all by default) in the original dict shape"""
+        currencies = CURRENCY_CODES.values
+        importances = IMPORTANCE_CODES.values
+        return [
+            {
+                'date': self.dates[i],
+                'time': self.times[i],
+                'currency': currencies[self.currencies[i]],
+                'event_name': self.names[i],
+                'importance': importances[self.importances[i]],
+                'actual': self.actuals[i],
+                'forecast': self.forecasts[i],
+                'previous': self.previous[i],
+                'timestamp': str(self.timestamps[i]),
+                'scraped_at': self.scraped_at_values[self.scraped_at_codes[i]]
+            }
+            for i in (range(len(self)) if indices is None else indices)
+        ]
+
+    def _postings(self, postings, codes):
+        lists = [postings[code] for code in codes if code in postings]
+        if len(lists) == 1:
+            return lists[0]
+        return sorted(chain.from_iterable(lists))
+
+class EventIndex:
+    """Cross-week secondary indexes over ingested EventBatches
+
+    Each currency code keeps (timestamp, id) pairs sorted by timestamp for
+    range queries; each importance code keeps a bitset of event ids. A week
+    that is ingested again gets fresh ids and its old ids are cleared from the
+    live bitset, then dropped at the next compaction.
+    """
+    def __init__(self, max_weeks=520):
+        self.max_weeks = max_weeks
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self._weeks = OrderedDict()
+        self._rows = []
+        self._live = 0
+        self._dead = 0
+        self._by_time = []
+        self._by_currency = {}
+        self._importance_bits = {}
+
+    def add_week(self, year, week, batch):
+        """Index a week's batch, replacing whatever was indexed for that week before"""
+        key = (int(year), int(week))
+        with self._lock:
+            self._drop(key)
+            base = len(self._rows)
+            self._weeks[key] = (base, batch)
+            for row in range(len(batch)):
+                event_id = base + row
+                entry = (batch.timestamps[row], event_id)
+                self._rows.append((batch, row))
+                self._live |= 1 << event_id
+                bisect.insort(self._by_time, entry)
+                bisect.insort(self._by_currency.setdefault(batch.currencies[row], []), entry)
+                importance = batch.importances[row]
+                self._importance_bits[importance] = self._importance_bits.get(importance, 0) | (1 << event_id)
+            
+            while len(self._weeks) > self.max_weeks:
+                self._drop(next(iter(self._weeks)))
+            if self._dead > len(self._rows) // 2:
+                self._compact()
+
+    def query(self, currency_filter=None, impact_filter=None, start_ts=None, end_ts=None, limit=None):
+        """Events across all indexed weeks matching the /calendar filters, ordered by timestamp"""
+        low = (start_ts if start_ts is not None else -2 ** 63, -1)
+        high = (end_ts if end_ts is not None else 2 ** 63 - 1, -1)
+        
+        with self._lock:
+            if currency_filter:
+                wanted = [c.upper().strip() for c in currency_filter.split(',')]
+                codes = CURRENCY_CODES.matching(lambda value: any(c in value.upper() for c in wanted))
+                lists = [self._by_currency[code] for code in codes if code in self._by_currency]
+            else:
+                lists = [self._by_time]
+            
+            mask = self._live
+            if impact_filter:
+                wanted = {i.lower().strip() for i in impact_filter.split(',')}
+                codes = IMPORTANCE_CODES.matching(lambda value: value.lower() in wanted)
+                impact_bits = 0
+                for code in codes:
+                    impact_bits |= self._importance_bits.get(code, 0)
+                mask &= impact_bits
+            
+            slices = [entries[bisect.bisect_left(entries, low):bisect.bisect_left(entries, high)] for entries in lists]
+            events = []
+            for _, event_id in heapq.merge(*slices):
+                if (mask >> event_id) & 1:
+                    batch, row = self._rows[event_id]
+                    events.append(batch.to_dicts((row,))[0])
+                    if limit and len(events) >= limit:
+                        break
+        return events
+
+    def stats(self):
+        with self._lock:
+            return {
+                'weeks': len(self._weeks),
+                'events': len(self._rows) - self._dead,
+                'dead_events': self._dead
+            }
+
+    def _drop(self, key):
+        previous = self._weeks.pop(key, None)
+        if previous:
+            base, batch = previous
+            span = ((1 << len(batch)) - 1) << base
+            self._live &= ~span
+            self._dead += len(batch)
+
+    def _compact(self):
+        weeks = list(self._weeks.items())
+        self._reset()
+        for (year, week), (_, batch) in weeks:
+            self.add_week(year, week, batch)
+
+def week_tier(year, week):
+    """Classify a week as 'past', 'current' or 'future' relative to today"""
+    current_year, current_week, _ = datetime.now().isocalendar()
+    target = (int(year), int(week))
+    current = (current_year, current_week)
+    if target < current:
+        return 'past'
+    if target == current:
+        return 'current'
+    return 'future'
+
+def week_settled(year, week, scraped_at, margin=21600):
+    """True if a week was scraped at least margin seconds after it ended, so its actuals are final"""
+    try:
+        scraped = datetime.fromisoformat(scraped_at)
+    except (TypeError, ValueError):
+        return False
+    week_end = datetime.combine(date.fromisocalendar(int(year), int(week), 7) + timedelta(days=1), datetime.min.time())
+    return scraped >= week_end + timedelta(seconds=margin)
+
+class EventStore:
+    """Embedded SQLite store of parsed events with upserts keyed on (date, time, currency, event_name)"""
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            date TEXT NOT NULL,
+            time TEXT NOT NULL,
+            currency TEXT NOT NULL,
+            event_name TEXT NOT NULL,
+            importance TEXT,
+            actual TEXT,
+            forecast TEXT,
+            previous TEXT,
+            timestamp INTEGER,
+            year INTEGER,
+            week INTEGER,
+            scraped_at TEXT,
+            updated_at TEXT,
+            PRIMARY KEY (date, time, currency, event_name)
+        );
+        CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_events_currency ON events (currency, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_events_importance ON events (importance, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_events_week ON events (year, week);
+        CREATE TABLE IF NOT EXISTS weeks (
+            year INTEGER NOT NULL,
+            week INTEGER NOT NULL,
+            scraped_at TEXT,
+            event_count INTEGER,
+            PRIMARY KEY (year, week)
+        );
+    """
+    UPSERT = """
+        INSERT INTO events (date, time, currency, event_name, importance, actual, forecast, previous,
+                            timestamp, year, week, scraped_at, updated_at)
+        VALUES (:date, :time, :currency, :event_name, :importance, :actual, :forecast, :previous,
+                :timestamp, :year, :week, :scraped_at, :updated_at)
+        ON CONFLICT (date, time, currency, event_name) DO UPDATE SET
+            importance = excluded.importance,
+            actual = excluded.actual,
+            forecast = excluded.forecast,
+            previous = excluded.previous,
+            timestamp = excluded.timestamp,
+            scraped_at = excluded.scraped_at,
+            updated_at = excluded.updated_at
+        WHERE events.actual IS NOT excluded.actual
+           OR events.forecast IS NOT excluded.forecast
+           OR events.previous IS NOT excluded.previous
+    """
+    COLUMNS = ('date', 'time', 'currency', 'event_name', 'importance', 'actual', 'forecast', 'previous', 'timestamp', 'scraped_at')
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(self.SCHEMA)
+
+    def save_week(self, year, week, events, scraped_at):
+        """Replace a week's events; only rows whose actual/forecast/previous changed are rewritten
+
+        Rows of the week missing from a non-empty scrape (e.g. a release whose
+        time moved) are deleted. An empty result is not recorded in weeks, so
+        a failed parse never stands in for the week. Returns the number of
+        rows inserted, updated or deleted.
+        """
+        updated_at = datetime.now().isoformat()
+        rows = [
+            dict(event, timestamp=int(event['timestamp']), year=int(year), week=int(week), updated_at=updated_at)
+            for event in events
+        ]
+        keys = {(row['date'], row['time'], row['currency'], row['event_name']) for row in rows}
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(self.UPSERT, rows)
+            if not events:
+                return self._conn.total_changes - before
+            stored = self._conn.execute(
+                'SELECT date, time, currency, event_name FROM events WHERE year = ? AND week = ?', (int(year), int(week))
+            ).fetchall()
+            self._conn.executemany(
+                'DELETE FROM events WHERE date = ? AND time = ? AND currency = ? AND event_name = ?',
+                [key for key in stored if key not in keys]
+            )
+            changed = self._conn.total_changes - before
+            self._conn.execute(
+                'INSERT OR REPLACE INTO weeks (year, week, scraped_at, event_count) VALUES (?, ?, ?, ?)',
+                (int(year), int(week), scraped_at, len(keys))
+            )
+        return changed
+
+    def load_week(self, year, week):
+        """Return (events, scraped_at) for a previously stored week, or None if it was never stored"""
+        with self._lock:
+            stored = self._conn.execute(
+                'SELECT scraped_at FROM weeks WHERE year = ? AND week = ?', (int(year), int(week))
+            ).fetchone()
+            if not stored:
+                return None
+            rows = self._conn.execute(
+                f'SELECT {", ".join(self.COLUMNS)} FROM events WHERE year = ? AND week = ? ORDER BY timestamp, rowid',
+                (int(year), int(week))
+            ).fetchall()
+        return [self._to_event(row) for row in rows], stored[0]
+
+    def query(self, start_ts=None, end_ts=None, currencies=None, impacts=None):
+        """Events with start_ts <= timestamp < end_ts, optionally limited to currency codes and impact levels"""
+        sql, params = self._query_sql(start_ts, end_ts, currencies, impacts)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_event(row) for row in rows]
+
+    def iter_query(self, start_ts=None, end_ts=None, currencies=None, impacts=None, batch_size=500):
+        """Like query, but yields events in batches from a dedicated read connection"""
+        sql, params = self._query_sql(start_ts, end_ts, currencies, impacts)
+        conn = sqlite3.connect(self.path)
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [self._to_event(row) for row in rows]
+        finally:
+            conn.close()
+
+    def _query_sql(self, start_ts, end_ts, currencies, impacts):
+        clauses, params = [], []
+        if start_ts is not None:
+            clauses.append('timestamp >= ?')
+            params.append(int(start_ts))
+        if end_ts is not None:
+            clauses.append('timestamp < ?')
+            params.append(int(end_ts))
+        # Same matching as apply_filters: currencies by substring, impacts exactly, both case-insensitive
+        if currencies:
+            clauses.append(f'({" OR ".join(["instr(upper(currency), ?) > 0"] * len(currencies))})')
+            params.extend(c.upper() for c in currencies)
+        if impacts:
+            clauses.append(f'lower(importance) IN ({", ".join("?" * len(impacts))})')
+            params.extend(i.lower() for i in impacts)
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        return f'SELECT {", ".join(self.COLUMNS)} FROM events {where} ORDER BY timestamp, rowid', params
+
+    def weeks(self, start=None, end=None):
+        """List (year, week, scraped_at, event_count) for stored weeks, optionally within start..end inclusive"""
+        clauses, params = [], []
+        if start:
+            clauses.append('(year > ? OR (year = ? AND week >= ?))')
+            params.extend((start[0], start[0], start[1]))
+        if end:
+            clauses.append('(year < ? OR (year = ? AND week <= ?))')
+            params.extend((end[0], end[0], end[1]))
+        where = f'WHERE {" AND ".join(clauses)}' if clauses else ''
+        with self._lock:
+            return self._conn.execute(
+                f'SELECT year, week, scraped_at, event_count FROM weeks {where} ORDER BY year, week', params
+            ).fetchall()
+
+    def stats(self):
+        with self._lock:
+            events = self._conn.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+            weeks = self._conn.execute('SELECT COUNT(*) FROM weeks').fetchone()[0]
+        return {'path': self.path, 'events': events, 'weeks': weeks}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _to_event(self, row):
+        event = dict(zip(self.COLUMNS, row))
+        event['timestamp'] = str(event['timestamp'])
+        return event
+
+class WeekSnapshot:
+    """Columnar week snapshots on disk, partitioned as year=YYYY/week=WW/events.<ext>
+
+    Each partition holds one week in the EventStore column layout, so
+    analytics jobs can read the Parquet files directly as a dataset.
+    """
+    FILENAMES = {'parquet': 'events.parquet', 'msgpack': 'events.msgpack.gz', 'json': 'events.json.gz'}
+    PARTITION_RE = re.compile(r'^year=(\d{4})$|^week=(\d{2})$')
+
+    def __init__(self, path, fmt=None):
+        fmt = fmt or self.default_format()
+        if fmt not in self.FILENAMES:
+            raise ValueError(f"Unknown snapshot format '{fmt}', expected one of {', '.join(self.FILENAMES)}")
+        if fmt == 'parquet' and pa is None:
+            raise ValueError("Snapshot format 'parquet' needs pyarrow installed")
+        if fmt == 'msgpack' and msgpack is None:
+            raise ValueError("Snapshot format 'msgpack' needs msgpack installed")
+        self.path = path
+        self.format = fmt
+
+    @staticmethod
+    def default_format():
+        if pa is not None:
+            return 'parquet'
+        if msgpack is not None:
+            return 'msgpack'
+        return 'json'
+
+    def write_week(self, year, week, events, scraped_at):
+        """Write one week's partition atomically and return its file path"""
+        columns = {name: [event.get(name) for event in events] for name in EventStore.COLUMNS}
+        columns['timestamp'] = [int(ts) for ts in columns['timestamp']]
+        directory = os.path.join(self.path, f'year={int(year)}', f'week={int(week):02d}')
+        os.makedirs(directory, exist_ok=True)
+        target = os.path.join(directory, self.FILENAMES[self.format])
+        tmp = f'{target}.tmp'
+        if self.format == 'parquet':
+            schema = pa.schema(
+                [(name, pa.int64() if name == 'timestamp' else pa.string()) for name in EventStore.COLUMNS],
+                metadata={'scraped_at': scraped_at or ''}
+            )
+            pq.write_table(pa.Table.from_pydict(columns, schema=schema), tmp, compression='zstd')
+        else:
+            payload = {'year': int(year), 'week': int(week), 'scraped_at': scraped_at, 'columns': columns}
+            body = msgpack.packb(payload) if self.format == 'msgpack' else json.dumps(payload).encode()
+            with gzip.open(tmp, 'wb', compresslevel=6) as f:
+                f.write(body)
+        os.replace(tmp, target)
+        return target
+
+    def read_week(self, path):
+        """Return (events, scraped_at) from a partition file written in any supported format"""
+        if path.endswith('.parquet'):
+            if pq is None:
+                raise ValueError(f"Reading {path} needs pyarrow installed")
+            table = pq.read_table(path)
+            columns = table.to_pydict()
+            scraped_at = (table.schema.metadata or {}).get(b'scraped_at', b'').decode() or None
+        else:
+            with gzip.open(path, 'rb') as f:
+                body = f.read()
+            if path.endswith('.msgpack.gz'):
+                if msgpack is None:
+                    raise ValueError(f"Reading {path} needs msgpack installed")
+                payload = msgpack.unpackb(body)
+            else:
+                payload = json.loads(body)
+            columns, scraped_at = payload['columns'], payload['scraped_at']
+        names = [name for name in EventStore.COLUMNS if name in columns]
+        events = [dict(zip(names, row)) for row in zip(*(columns[name] for name in names))]
+        for event in events:
+            event['timestamp'] = str(event['timestamp'])
+        return events, scraped_at
+
+    def partitions(self):
+        """List (year, week, path) for every week partition under the snapshot root, in week order"""
+        found = []
+        if not os.path.isdir(self.path):
+            return found
+        for year_dir in os.listdir(self.path):
+            year_match = self.PARTITION_RE.match(year_dir)
+            if not year_match or not year_match.group(1):
+                continue
+            for week_dir in os.listdir(os.path.join(self.path, year_dir)):
+                week_match = self.PARTITION_RE.match(week_dir)
+                if not week_match or not week_match.group(2):
+                    continue
+                directory = os.path.join(self.path, year_dir, week_dir)
+                for filename in self.FILENAMES.values():
+                    if os.path.exists(os.path.join(directory, filename)):
+                        found.append((int(year_match.group(1)), int(week_match.group(2)), os.path.join(directory, filename)))
+                        break
+        found.sort()
+        return found
+
+    def write_manifest(self, weeks):
+        """Record what the snapshot holds; weeks is a list of (year, week, scraped_at, event_count)"""
+        manifest = {
+            'format': self.format,
+            'created_at': datetime.now().isoformat(),
+            'columns': list(EventStore.COLUMNS),
+            'weeks': [
+                {'week': f'{year}-W{week:02d}', 'scraped_at': scraped_at, 'events': count}
+                for year, week, scraped_at, count in weeks
+            ]
+        }
+        with open(os.path.join(self.path, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+class WeekCache:
+    """LRU cache of scraped weeks with per-tier TTLs and stale-while-revalidate"""
+    def __init__(self, max_weeks=128, max_events=50000, past_ttl=7 * 86400, current_ttl=300,
+                 future_ttl=3600, max_stale=86400):
+        self.max_weeks = max_weeks
+        self.max_events = max_events
+        self.past_ttl = past_ttl
+        self.current_ttl = current_ttl
+        self.future_ttl = future_ttl
+        self.max_stale = max_stale
+        self._entries = OrderedDict()
+        self._event_count = 0
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def ttl_for(self, year, week):
+        """Past weeks are effectively immutable; the current week changes as actuals print"""
+        tier = week_tier(year, week)
+        if tier == 'past':
+            return self.past_ttl
+        if tier == 'current':
+            return self.current_ttl
+        return self.future_ttl
+
+    def get(self, key):
+        """Return (data, state) where state is 'hit', 'stale' or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                metrics.inc('cache_requests_total', result='miss')
+                return None, None
+            data, expires_at = entry
+            if now < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.inc('cache_requests_total', result='hit')
+                return data, 'hit'
+            if now < expires_at + self.max_stale:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                metrics.inc('cache_requests_total', result='stale')
+                return data, 'stale'
+            self._remove(key)
+            self.misses += 1
+            metrics.inc('cache_requests_total', result='miss')
+            return None, None
+
+    def set(self, key, data, year, week):
+        """Store a scraped week and evict least-recently-used weeks over the size limits"""
+        # An empty week is more likely a bad parse than a quiet week, so it gets the shortest TTL
+        ttl = self.ttl_for(year, week) if len(data['events']) else self.current_ttl
+        expires_at = time.monotonic() + ttl
+        if not isinstance(data['events'], EventBatch):
+            data = dict(data, events=EventBatch(data['events']))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, expires_at)
+            self._event_count += len(data['events'])
+            while len(self._entries) > 1 and (
+                    len(self._entries) > self.max_weeks or self._event_count > self.max_events):
+                self._remove(next(iter(self._entries)))
+
+    def peek(self, key):
+        """Return cached data regardless of freshness, without touching LRU order or stats"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry else None
+
+    def begin_refresh(self, key):
+        """Claim a background refresh for a key; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+
+    def end_refresh(self, key):
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'weeks': len(self._entries),
+                'events': self._event_count,
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses
+            }
+
+    def _remove(self, key):
+        data, _ = self._entries.pop(key)
+        self._event_count -= len(data['events'])
+
+class ScrapeQueueFull(Exception):
+    """Raised when scrapes or their waiters are saturated; carries a Retry-After estimate in seconds"""
+    def __init__(self, retry_after):
+        super().__init__(f'Scrape queue is full, retry after {retry_after}s')
+        self.retry_after = retry_after
+
+class FlightCall:
+    """An in-flight call whose outcome is shared by every waiter"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single execution
+
+    Followers hold a request thread while they wait, so at most max_waiters
+    may wait at once (beyond that ScrapeQueueFull is raised with retry_after())
+    and each waits at most timeout seconds before TimeoutError.
+    """
+    def __init__(self, max_waiters=None, timeout=None, retry_after=None):
+        self.max_waiters = max_waiters
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._calls = {}
+        self._waiting = 0
+        self._lock = threading.Lock()
+        self.coalesced = 0
+        self.rejected = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn once per key at a time; concurrent callers receive the same result or exception"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = FlightCall()
+                self._calls[key] = call
+            elif self.max_waiters is not None and self._waiting >= self.max_waiters:
+                self.rejected += 1
+                metrics.inc('scrape_rejections_total')
+                raise ScrapeQueueFull(self.retry_after() if self.retry_after else 1)
+            else:
+                self.coalesced += 1
+                self._waiting += 1
+        
+        if not leader:
+            try:
+                if not call.done.wait(self.timeout):
+                    raise TimeoutError(f'Scrape did not finish within {self.timeout}s')
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def waiting(self):
+        with self._lock:
+            return self._waiting
+
+class HttpCalendarFetcher:
+    """Fetch server-rendered calendar pages over a pooled keep-alive HTTP session"""
+    def __init__(self, calendar_url, transport=None, timeout=10, pool_size=10):
+        self.calendar_url = calendar_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        # Any requests transport adapter can be mounted, e.g. one pointed at a local fixture server
+        adapter = transport or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+
+    def fetch(self, year, week):
+        """Return the raw page for ?week=YYYY-Www, or None if the request failed"""
+        url = f"{self.calendar_url}?week={year}-W{week}"
+        try:
+            with metrics.span('http_fetch'):
+                response = self.session.get(url, timeout=self.timeout)
+            if response.status_code != 200:
+                print(f"HTTP fetch returned {response.status_code} for {url}")
+                return None
+            return response.text
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {str(e)}")
+            return None
+
+class ReleaseWatcher:
+    """Watches imminent high-impact releases in the current week from a parked browser
+
+    Around each release a pooled driver stays on the current-week page and only
+    that day's block is re-read at sub-second intervals. A release stops being
+    polled once its actual appears or after linger seconds; the driver goes
+    back to the pool whenever nothing is due.
+    """
+    def __init__(self, scraper, lead=120, linger=600, poll_interval=0.5, reload_interval=15, idle_interval=30):
+        self.scraper = scraper
+        self.lead = lead
+        self.linger = linger
+        self.poll_interval = poll_interval
+        self.reload_interval = reload_interval
+        self.idle_interval = idle_interval
+        self.month_names = {number: name for name, number in scraper.months.items()}
+        self._parked = None
+        self._parked_url = None
+        self._loaded_at = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.polls = 0
+        self.releases_seen = 0
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name='release-watcher', daemon=True)
+        self._thread.start()
+        print("Release watcher started")
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self):
+        return {
+            'enabled': self._thread is not None,
+            'parked': self._parked is not None,
+            'polls': self.polls,
+            'releases_seen': self.releases_seen
+        }
+
+    def pending_releases(self, events, now=None):
+        """High-impact events without an actual whose release is within lead seconds ahead or linger behind"""
+        now = now or time.time()
+        pending = []
+        for event in events:
+            if event.get('importance') != 'High' or event.get('actual'):
+                continue
+            try:
+                release_at = int(event['timestamp'])
+            except (KeyError, ValueError):
+                continue
+            if release_at - self.lead <= now <= release_at + self.linger:
+                pending.append(event)
+        return pending
+
+    def _loop(self):
+        while not self._stop.is_set():
+            delay = self.idle_interval
+            try:
+                delay = self._tick()
+            except Exception as e:
+                print(f"Release watcher error: {str(e)}")
+                self._release_driver(discard=True)
+            self._stop.wait(delay)
+        self._release_driver()
+
+    def _tick(self):
+        """One watch cycle; returns seconds to wait before the next"""
+        year, week, url = self.scraper.resolve_week()
+        data = self.scraper.cache.peek(url) or self.scraper.load_week(year, week)
+        if 'error' in data:
+            return self.idle_interval
+        
+        pending = self.pending_releases(data['events'])
+        if not pending:
+            self._release_driver()
+            return self._until_next_release(data['events'])
+        
+        if not self._park(url):
+            return self.idle_interval
+        
+        # Releases not yet due are only polled once they are close
+        now = time.time()
+        due_dates = sorted({e['date'] for e in pending if int(e['timestamp']) - now <= self.poll_interval * 4})
+        if not due_dates:
+            return min(self.poll_interval * 4, max(self.poll_interval, min(int(e['timestamp']) for e in pending) - now))
+        
+        # Not every page pushes updates into the DOM, so reload it while actuals are overdue
+        if now - self._loaded_at >= self.reload_interval:
+            self._load_page(url)
+        
+        refreshed = []
+        for event_date in due_dates:
+            refreshed.extend(self._read_day(year, week, event_date))
+        self.polls += 1
+        metrics.inc('release_watch_polls_total')
+        
+        self._merge(year, week, url, data, pending, refreshed)
+        return self.poll_interval
+
+    def _until_next_release(self, events):
+        now = time.time()
+        upcoming = []
+        for event in events:
+            if event.get('importance') == 'High' and not event.get('actual'):
+                try:
+                    upcoming.append(int(event['timestamp']) - self.lead - now)
+                except (KeyError, ValueError):
+                    continue
+        upcoming = [seconds for seconds in upcoming if seconds > 0]
+        return max(1, min([self.idle_interval] + upcoming))
+
+    def _park(self, url):
+        if self._parked and self._parked_url == url:
+            return True
+        self._release_driver()
+        self._parked = self.scraper.pool.checkout(timeout=5)
+        if not self._parked:
+            return False
+        print("Release watcher parked a driver on the current week")
+        self._load_page(url)
+        return True
+
+    def _load_page(self, url):
+        self._parked.driver.get(url)
+        self.scraper.interact_with_site(self._parked.driver)
+        self._parked_url = url
+        self._loaded_at = time.time()
+
+    def _read_day(self, year, week, event_date):
+        """Re-parse just the rows of one day block from the parked page"""
+        _, month_num, day_number = event_date.split('-')
+        block_html = self._parked.driver.execute_script(
+            DAY_BLOCK_SCRIPT, self.month_names.get(month_num, ''), str(int(day_number))
+        )
+        if not block_html:
+            return []
+        return list(self.scraper.iter_calendar_events(block_html, year, week))
+
+    def _merge(self, year, week, url, data, pending, refreshed):
+        """Fold refreshed rows into the cached week and publish it if a pending actual printed"""
+        refreshed_by_key = {event_key(event): event for event in refreshed}
+        printed = [
+            refreshed_by_key[event_key(event)] for event in pending
+            if refreshed_by_key.get(event_key(event), {}).get('actual')
+        ]
+        if not printed:
+            return
+        
+        now = time.time()
+        for event in printed:
+            self.releases_seen += 1
+            metrics.observe('release_detection_delay_seconds', max(0.0, now - int(event['timestamp'])))
+            print(f"Release printed: {event['currency']} {event['event_name']} actual={event['actual']}")
+        
+        events = [refreshed_by_key.pop(event_key(event), event) for event in data['events']]
+        events.extend(refreshed_by_key.values())
+        fresh = dict(data, events=events, scraped_at=datetime.now().isoformat(), fetched_via='release_watch')
+        self.scraper.ingest_week(year, week, fresh)
+        self.scraper.cache_week(year, week, fresh)
+
+    def _release_driver(self, discard=False):
+        if self._parked:
+            self.scraper.pool.checkin(self._parked, discard=discard)
+            self._parked = None
+            self._parked_url = None
+
+class PrewarmScheduler:
+    """Keeps the /weeks window warm by refreshing it in the background
+
+    The current week refreshes more often than the rest of the window, and any
+    week with a high-impact release close to now refreshes faster still.
+    """
+    def __init__(self, scraper, current_interval=300, window_interval=3600, release_interval=60,
+                 release_window=900, jitter=0.1, max_concurrent=1, tick=5):
+        self.scraper = scraper
+        self.current_interval = current_interval
+        self.window_interval = window_interval
+        self.release_interval = release_interval
+        self.release_window = release_window
+        self.jitter = jitter
+        self.tick = tick
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix='prewarm')
+        self._next_due = {}
+        self._running = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name='prewarm-scheduler', daemon=True)
+        self._thread.start()
+        print("Pre-warm scheduler started")
+
+    def stop(self):
+        self._stop.set()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def interval_for(self, offset, year, week):
+        """Seconds until a week should be refreshed again"""
+        _, _, url = self.scraper.resolve_week(year, week)
+        data = self.scraper.cache.peek(url)
+        if data and self._near_release(data['events']):
+            return self.release_interval
+        if offset == 0:
+            return self.current_interval
+        return self.window_interval
+
+    def stats(self):
+        with self._lock:
+            running = len(self._running)
+        return {
+            'enabled': self._thread is not None,
+            'running': running,
+            'refreshes': self.refreshes,
+            'failures': self.failures
+        }
+
+    def _near_release(self, events):
+        now = time.time()
+        for event in events:
+            if event.get('importance') != 'High':
+                continue
+            try:
+                if abs(int(event['timestamp']) - now) <= self.release_window:
+                    return True
+            except (KeyError, ValueError):
+                continue
+        return False
+
+    def _loop(self):
+        while not self._stop.is_set():
+            now = time.time()
+            for offset, year, week, _ in week_window():
+                key = (year, week)
+                with self._lock:
+                    if key in self._running or self._next_due.get(key, 0) > now:
+                        continue
+                    self._running.add(key)
+                self.executor.submit(self._refresh, offset, year, week)
+            self._stop.wait(self.tick)
+
+    def _refresh(self, offset, year, week):
+        key = (year, week)
+        try:
+            data = self.scraper.load_week(year, week)
+            if 'error' in data:
+                self.failures += 1
+                print(f"Pre-warm of {year}-W{week:02d} failed: {data['error']}")
+            else:
+                self.refreshes += 1
+        except Exception as e:
+            self.failures += 1
+            print(f"Pre-warm of {year}-W{week:02d} failed: {str(e)}")
+        finally:
+            interval = self.interval_for(offset, year, week)
+            interval *= 1 + random.uniform(-self.jitter, self.jitter)
+            window = {(y, w) for _, y, w, _ in week_window()}
+            with self._lock:
+                self._next_due[key] = time.time() + interval
+                self._running.discard(key)
+                # Forget weeks that have rolled out of the window
+                for stale_key in [k for k in self._next_due if k not in window]:
+                    del self._next_due[stale_key]
+
+def event_key(event):
+    """Natural key of an event, shared by the event store and the change feed"""
+    return event['date'], event['time'], event['currency'], event['event_name']
+
+class ChangeFeed:
+    """Cursor-addressed log of events whose actual/forecast/previous changed between scrapes
+
+    Each week's last parse is kept as a snapshot; every new parse is diffed
+    against it and only new or changed events are appended to a bounded log.
+    """
+    TRACKED_FIELDS = ('actual', 'forecast', 'previous')
+
+    def __init__(self, max_changes=10000, max_weeks=64):
+        self.max_weeks = max_weeks
+        self._log = deque(maxlen=max_changes)
+        self._snapshots = OrderedDict()
+        self._cursor = 0
+        self._cond = threading.Condition()
+
+    def has_snapshot(self, year, week):
+        with self._cond:
+            return (str(year), str(week)) in self._snapshots
+
+    def seed(self, year, week, events):
+        """Set a week's baseline without emitting changes"""
+        with self._cond:
+            self._store_snapshot((str(year), str(week)), self._snapshot(events))
+
+    def record(self, year, week, events):
+        """Diff a fresh parse against the week's snapshot and log the differences; returns the number logged"""
+        key = (str(year), str(week))
+        snapshot = self._snapshot(events)
+        detected_at = datetime.now().isoformat()
+        with self._cond:
+            previous = self._snapshots.get(key)
+            self._store_snapshot(key, snapshot)
+            if previous is None:
+                return 0
+            
+            logged = 0
+            for natural_key, (values, event) in snapshot.items():
+                before = previous.get(natural_key)
+                if before is None:
+                    change, changed_fields, old_values = 'added', list(self.TRACKED_FIELDS), {}
+                else:
+                    changed_fields = [f for f, old, new in zip(self.TRACKED_FIELDS, before[0], values) if old != new]
+                    if not changed_fields:
+                        continue
+                    change = 'updated'
+                    old_values = {f: before[1].get(f, '') for f in changed_fields}
+                
+                self._cursor += 1
+                self._log.append({
+                    'cursor': self._cursor,
+                    'week': f"{key[0]}-W{key[1]}",
+                    'change': change,
+                    'changed_fields': changed_fields,
+                    'previous_values': old_values,
+                    'event': event,
+                    'detected_at': detected_at
+                })
+                logged += 1
+            
+            if logged:
+                metrics.inc('change_feed_events_total', logged)
+                self._cond.notify_all()
+            return logged
+
+    def since(self, cursor, limit=1000):
+        """Changes after cursor, the cursor to resume from, and whether older changes were dropped"""
+        with self._cond:
+            first = self._log[0]['cursor'] if self._log else self._cursor + 1
+            # A cursor from before the buffer, or from a previous process, cannot be resumed exactly
+            truncated = cursor < first - 1 or cursor > self._cursor
+            if cursor > self._cursor:
+                cursor = 0
+            changes = [c for c in self._log if c['cursor'] > cursor][:limit]
+            next_cursor = changes[-1]['cursor'] if changes else max(cursor, first - 1)
+        return changes, next_cursor, truncated
+
+    def wait(self, cursor, timeout):
+        """Block until a change after cursor is logged or timeout passes
+
+        A cursor ahead of the log (from a previous process) returns at once,
+        so the caller's since() can reset it instead of waiting for the log
+        to catch up.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._cursor != cursor, timeout)
+
+    def latest_cursor(self):
+        with self._cond:
+            return self._cursor
+
+    def _snapshot(self, events):
+        return {
+            event_key(event): (tuple(event.get(f, '') for f in self.TRACKED_FIELDS), event)
+            for event in events
+        }
+
+    def _store_snapshot(self, key, snapshot):
+        self._snapshots[key] = snapshot
+        self._snapshots.move_to_end(key)
+        while len(self._snapshots) > self.max_weeks:
+            self._snapshots.popitem(last=False)
+
+class ScrapeExecutor:
+    """Bounded executor for scrape work with queue-depth admission control
+
+    Request threads only wait on scrapes that were admitted; once max_workers
+    scrapes are running and max_queue more are waiting, new work is rejected
+    immediately so the API's other endpoints stay responsive.
+    """
+    def __init__(self, max_workers=2, max_queue=8, timeout=120):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._avg_duration = 5.0
+        self.rejected = 0
+
+    def run(self, fn, *args):
+        """Run fn on the executor and wait for its result, or raise ScrapeQueueFull"""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                metrics.inc('scrape_rejections_total')
+                raise ScrapeQueueFull(self.retry_after())
+            self._pending += 1
+        
+        try:
+            future = self.executor.submit(self._timed, fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            return {'error': f'Scrape did not finish within {self.timeout}s'}
+
+    def retry_after(self):
+        """Seconds until a queue slot is likely to free up, from the recent scrape duration"""
+        waves = max(1, self._pending - self.max_workers + 1) / self.max_workers
+        return max(1, math.ceil(waves * self._avg_duration))
+
+    def stats(self):
+        with self._lock:
+            pending = self._pending
+        return {
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'running': min(pending, self.max_workers),
+            'queued': max(0, pending - self.max_workers),
+            'rejected': self.rejected
+        }
+
+    def _timed(self, fn, *args):
+        start = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            duration = time.monotonic() - start
+            with self._lock:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
 class BabyPipsSeleniumScraper:
     def __init__(self):
         self.base_url = "https://www.babypips.com"
@@ -21,6 +1749,57 @@ class BabyPipsSeleniumScraper:
             'May': '05', 'Jun': '06', 'Jul': '07', 'Aug': '08',
             'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dec': '12'
         }
+        self.lean_page = os.environ.get('LEAN_PAGE', '1') == '1'
+        self.blocked_urls = BLOCKED_URL_PATTERNS + [
+            pattern.strip() for pattern in os.environ.get('LEAN_PAGE_EXTRA_BLOCKED', '').split(',') if pattern.strip()
+        ]
+        # Chrome locks a profile directory, so each live driver leases its own slot under the cache root
+        self.profile_root = os.environ.get('CHROME_PROFILE_DIR', '')
+        self._free_profiles = []
+        self._profile_count = 0
+        self._profile_lock = threading.Lock()
+        self.pool = DriverPool(
+            self.initialize_driver,
+            max_size=int(os.environ.get('DRIVER_POOL_SIZE', '2')),
+            max_pages=int(os.environ.get('DRIVER_MAX_PAGES', '50')),
+            max_rss_mb=int(os.environ.get('DRIVER_MAX_RSS_MB', '1024')),
+            idle_timeout=int(os.environ.get('DRIVER_IDLE_TIMEOUT', '300')),
+            on_quit=self.release_profile
+        )
+        atexit.register(self.pool.close)
+        self.cache = WeekCache(
+            max_weeks=int(os.environ.get('CACHE_MAX_WEEKS', '128')),
+            max_events=int(os.environ.get('CACHE_MAX_EVENTS', '50000')),
+            past_ttl=int(os.environ.get('CACHE_TTL_PAST', str(7 * 86400))),
+            current_ttl=int(os.environ.get('CACHE_TTL_CURRENT', '300')),
+            future_ttl=int(os.environ.get('CACHE_TTL_FUTURE', '3600')),
+            max_stale=int(os.environ.get('CACHE_MAX_STALE', '86400'))
+        )
+        self.index = EventIndex(max_weeks=int(os.environ.get('INDEX_MAX_WEEKS', '520')))
+        self.changes = ChangeFeed(max_changes=int(os.environ.get('CHANGE_FEED_SIZE', '10000')))
+        self.scrape_executor = ScrapeExecutor(
+            max_workers=int(os.environ.get('SCRAPE_WORKERS', os.environ.get('DRIVER_POOL_SIZE', '2'))),
+            max_queue=int(os.environ.get('SCRAPE_QUEUE_DEPTH', '8')),
+            timeout=int(os.environ.get('SCRAPE_TIMEOUT', '120'))
+        )
+        self.flights = SingleFlight(
+            max_waiters=int(os.environ.get('SCRAPE_MAX_WAITERS', '8')),
+            timeout=self.scrape_executor.timeout,
+            retry_after=self.scrape_executor.retry_after
+        )
+        self.store = None
+        store_path = os.environ.get('EVENT_STORE_PATH', 'data/events.db')
+        if store_path:
+            self.store = EventStore(store_path)
+            atexit.register(self.store.close)
+        self.settle_margin = int(os.environ.get('STORE_SETTLE_MARGIN', '21600'))
+        self.range_workers = int(os.environ.get('RANGE_WORKERS', os.environ.get('DRIVER_POOL_SIZE', '2')))
+        self.http_fetcher = None
+        if os.environ.get('HTTP_FAST_PATH', '1') == '1':
+            self.http_fetcher = HttpCalendarFetcher(
+                self.calendar_url,
+                timeout=int(os.environ.get('HTTP_FETCH_TIMEOUT', '10'))
+            )
         
     def initialize_driver(self):
         """Initialize Chrome webdriver with optimized options"""
@@ -34,112 +1813,412 @@ class BabyPipsSeleniumScraper:
         options.add_argument('--disable-logging')
         options.add_argument('--disable-web-security')
         options.add_argument('--allow-running-insecure-content')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        options.add_argument(f'--user-agent={USER_AGENT}')
         
+        if self.lean_page:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        
+        driver = profile_dir = None
         try:
-            driver = webdriver.Chrome(options=options)
+            profile_dir = self.lease_profile()
+            if profile_dir:
+                options.add_argument(f'--user-data-dir={profile_dir}')
+                options.add_argument(f'--disk-cache-dir={os.path.join(profile_dir, "cache")}')
+                options.add_argument('--disk-cache-size=268435456')
+            
+            with metrics.span('driver_boot'):
+                driver = webdriver.Chrome(options=options)
             driver.set_page_load_timeout(30)
+            driver.profile_dir = profile_dir
+            if self.lean_page:
+                # Block images, fonts, media and third-party trackers at the network layer
+                driver.execute_cdp_cmd('Network.enable', {})
+                driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_urls})
             return driver
         except Exception as e:
             print(f"Error initializing webdriver: {str(e)}")
+            # Chrome holds the profile lock until it exits, so quit it before the slot is reused
+            if driver is not None:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            if profile_dir:
+                self._free_profile(profile_dir)
+            return None
+
+    def lease_profile(self):
+        """Reserve a persistent Chrome profile directory, or None when CHROME_PROFILE_DIR is unset"""
+        if not self.profile_root:
             return None
+        with self._profile_lock:
+            if self._free_profiles:
+                return self._free_profiles.pop()
+            self._profile_count += 1
+            profile_dir = os.path.join(self.profile_root, f'slot-{self._profile_count}')
+        os.makedirs(profile_dir, exist_ok=True)
+        return profile_dir
+
+    def release_profile(self, driver):
+        """Pool hook: hand a quit driver's profile directory to the next driver"""
+        profile_dir = getattr(driver, 'profile_dir', None)
+        if profile_dir:
+            self._free_profile(profile_dir)
+
+    def _free_profile(self, profile_dir):
+        with self._profile_lock:
+            self._free_profiles.append(profile_dir)
+
+    def record_page_load(self, driver):
+        """Sample Navigation/Resource Timing for bytes transferred and load time of the current page"""
+        try:
+            timing = driver.execute_script(PAGE_TIMING_SCRIPT)
+        except Exception as e:
+            print(f"Could not read page timing: {str(e)}")
+            return
+        if not timing:
+            return
+        mode = 'lean' if self.lean_page else 'full'
+        metrics.inc('page_bytes_transferred_total', timing['bytes'], mode=mode)
+        metrics.observe('page_transfer_bytes', timing['bytes'], mode=mode)
+        metrics.observe('page_load_seconds', timing['load_ms'] / 1000, mode=mode)
+        print(f"Page transferred {timing['bytes']} bytes in {timing['resources']} resources, loaded in {timing['load_ms']:.0f}ms")
 
     def interact_with_site(self, driver):
-        """Interact with site to load proper calendar view"""
+        """Interact with site to load proper calendar view and wait until it is ready
+
+        Returns a dict of per-phase wall times in seconds.
+        """
+        timings = {}
+        phase_start = time.monotonic()
         try:
-            # Wait for page to load
-            WebDriverWait(driver, 10).until(
+            # Start watching DOM mutations before anything re-renders
+            WebDriverWait(driver, 10, poll_frequency=0.1).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
+            driver.execute_script(READINESS_SCRIPT)
+            timings['body'] = time.monotonic() - phase_start
             
-            # Try to click week button (first xpath pattern)
+            # Try to click week button, polling both layout patterns at once
+            phase_start = time.monotonic()
             try:
-                week_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, '/html/body/div[2]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[2]/button[1]'))
+                pattern, week_button = WebDriverWait(driver, 5, poll_frequency=0.1).until(
+                    first_clickable(WEEK_BUTTON_XPATHS)
                 )
+                if pattern > 0:
+                    metrics.inc('fallback_selector_hits_total', kind='week_button_xpath')
                 week_button.click()
-                print("Week button clicked (pattern 1)")
+                print(f"Week button clicked (pattern {pattern + 1})")
+                timings['week_button'] = time.monotonic() - phase_start
                 
-                # Set timezone if needed
+                # Set timezone if needed, using the layout the week button was found in
+                phase_start = time.monotonic()
                 try:
-                    timestamp_key = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, '/html/body/div[2]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[1]/button'))
+                    timestamp_key = WebDriverWait(driver, 3, poll_frequency=0.1).until(
+                        EC.element_to_be_clickable((By.XPATH, TIMEZONE_BUTTON_XPATHS[pattern]))
                     )
                     timestamp_key.click()
                     
-                    select_timestamp = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((By.XPATH, '/html/body/div[2]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[1]/ol/li[13]/div'))
+                    select_timestamp = WebDriverWait(driver, 3, poll_frequency=0.1).until(
+                        EC.element_to_be_clickable((By.XPATH, TIMEZONE_OPTION_XPATHS[pattern]))
                     )
                     select_timestamp.click()
-                    print("Timezone set")
+                    print(f"Timezone set (pattern {pattern + 1})")
                 except:
-                    print("Timezone setting skipped")
+                    print(f"Timezone setting skipped (pattern {pattern + 1})")
+                timings['timezone'] = time.monotonic() - phase_start
                     
-            except:
-                # Try alternative xpath pattern
-                try:
-                    week_button = WebDriverWait(driver, 5).until(
-                        EC.element_to_be_clickable((By.XPATH, '/html/body/div[1]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[2]/button[1]'))
-                    )
-                    week_button.click()
-                    print("Week button clicked (pattern 2)")
-                    
-                    # Set timezone
-                    try:
-                        timestamp_key = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, '/html/body/div[1]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[1]/button'))
-                        )
-                        timestamp_key.click()
-                        
-                        select_timestamp = WebDriverWait(driver, 3).until(
-                            EC.element_to_be_clickable((By.XPATH, '/html/body/div[1]/div[2]/section[2]/div/div/div[1]/div/div[2]/div[1]/ol/li[13]/div'))
-                        )
-                        select_timestamp.click()
-                        print("Timezone set (pattern 2)")
-                    except:
-                        print("Timezone setting skipped (pattern 2)")
-                        
-                except Exception as e:
-                    print(f"Could not interact with site elements: {str(e)}")
-                    
-            # Wait a bit for content to load after interaction
-            time.sleep(2)
+            except Exception as e:
+                print(f"Could not interact with site elements: {str(e)}")
+                timings['week_button'] = time.monotonic() - phase_start
+            
+            # Wait for the day container to render and the DOM to go quiet
+            phase_start = time.monotonic()
+            try:
+                WebDriverWait(driver, 10, poll_frequency=0.1).until(calendar_ready)
+            except TimeoutException:
+                print("Calendar did not settle before timeout, parsing current DOM")
+            timings['calendar_ready'] = time.monotonic() - phase_start
             
         except Exception as e:
             print(f"Error interacting with site: {str(e)}")
-
-    def scrape_calendar(self, year=None, week=None, currency_filter=None, impact_filter=None, max_retries=3):
-        """Scrape economic calendar using Selenium"""
         
-        # Use current year/week if not provided
+        print("Phase timings: " + ", ".join(f"{name}={seconds:.2f}s" for name, seconds in timings.items()))
+        for name, seconds in timings.items():
+            metrics.observe('scrape_phase_seconds', seconds, phase=f'wait_{name}')
+        return timings
+
+    def resolve_week(self, year=None, week=None):
+        """Normalize year/week (defaulting to the current week) and build the calendar URL"""
+        # Use current ISO year/week if not provided; around New Year the ISO year differs from the calendar year
         if not year or not week:
-            current_date = datetime.now()
-            year = str(current_date.year)
-            week = str(current_date.isocalendar()[1])
+            year, week, _ = datetime.now().isocalendar()
         
         year = str(year)
         week = f"{int(week):02d}"
         url = f"{self.calendar_url}?week={year}-W{week}"
+        return year, week, url
+
+    def scrape_calendar(self, year=None, week=None, currency_filter=None, impact_filter=None, max_retries=3):
+        """Get economic calendar for a week, served from cache when possible"""
+        year, week, url = self.resolve_week(year, week)
+        
+        data, state = self.cache.get(url)
+        if state == 'stale':
+            self.refresh_in_background(year, week, max_retries)
+        elif state is None:
+            data = self.load_week(year, week, max_retries)
+            if 'error' in data:
+                return data
+            state = 'miss'
+        
+        # Apply filters on the cached week so filter variants never re-scrape
+        filtered_events = self.apply_filters(data['events'], currency_filter, impact_filter)
+        
+        return {
+            'success': True,
+            'total_events': len(filtered_events),
+            'events': filtered_events,
+            'filters_applied': {
+                'year': year,
+                'week': f'W{week}',
+                'currency': currency_filter,
+                'impact': impact_filter
+            },
+            'scraped_at': data['scraped_at'],
+            'source': url,
+            'fetched_via': data.get('fetched_via'),
+            'cache': state
+        }
+
+    def scrape_range(self, start, end, currency_filter=None, impact_filter=None, max_workers=None):
+        """Scrape a range of ISO weeks in parallel, yielding one result per week in week order
+
+        start and end are (year, week) tuples. A failed week yields its error
+        instead of aborting the whole range.
+        """
+        weeks = iter_weeks(start, end)
+        workers = max(1, min(len(weeks), max_workers or self.range_workers))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='range-scrape')
+        try:
+            futures = [
+                executor.submit(self.scrape_calendar, year, week, currency_filter, impact_filter)
+                for year, week in weeks
+            ]
+            for (year, week), future in zip(weeks, futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'error': 'Week scrape failed', 'last_error': str(e)}
+                yield {'week': f"{year}-W{week:02d}", **result}
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def refresh_in_background(self, year, week, max_retries=3):
+        """Re-scrape a week on a daemon thread and replace its cache entry"""
+        _, _, url = self.resolve_week(year, week)
+        if not self.cache.begin_refresh(url):
+            return
+        
+        def refresh():
+            try:
+                self.load_week(year, week, max_retries)
+            except Exception as e:
+                print(f"Background refresh of {url} failed: {str(e)}")
+            finally:
+                self.cache.end_refresh(url)
+        
+        threading.Thread(target=refresh, name=f'refresh-{year}-W{week}', daemon=True).start()
+
+    def load_week(self, year, week, max_retries=3):
+        """Scrape a week and cache it, coalescing concurrent loads of the same week"""
+        year, week, url = self.resolve_week(year, week)
+        
+        def load():
+            data = stored_data = None
+            # Past weeks do not change once scraped after they ended, so answer those from the store
+            if self.store and week_tier(year, week) == 'past':
+                stored = self.store.load_week(year, week)
+                if stored:
+                    events, scraped_at = stored
+                    stored_data = {
+                        'success': True,
+                        'events': events,
+                        'scraped_at': scraped_at,
+                        'source': url,
+                        'fetched_via': 'store'
+                    }
+                    if week_settled(year, week, scraped_at, self.settle_margin):
+                        data = stored_data
+            
+            if data is None:
+                data = self.scrape_executor.run(self.fetch_week, year, week, max_retries)
+                if 'error' in data:
+                    # A week stored before it ended is still better than an error
+                    if stored_data is None:
+                        return data
+                    data = stored_data
+                else:
+                    self.ingest_week(year, week, data)
+            
+            metrics.inc('week_loads_total', source=data.get('fetched_via') or 'unknown')
+            self.cache_week(year, week, data)
+            return data
+        
+        try:
+            return self.flights.do((year, week), load)
+        except TimeoutError as e:
+            return {'error': str(e)}
+
+    def cache_week(self, year, week, data):
+        """Cache a loaded week as an EventBatch and add it to the cross-week index"""
+        year, week, url = self.resolve_week(year, week)
+        if not isinstance(data['events'], EventBatch):
+            data = dict(data, events=EventBatch(data['events']))
+        self.cache.set(url, data, year, week)
+        with metrics.span('index_update'):
+            self.index.add_week(year, week, data['events'])
+
+    def export_snapshot(self, path, fmt=None, start=None, end=None):
+        """Write every stored week (optionally start..end inclusive) to a partitioned snapshot"""
+        if not self.store:
+            raise ValueError('Exporting needs the event store (EVENT_STORE_PATH)')
+        snapshot = WeekSnapshot(path, fmt)
+        weeks = self.store.weeks(start, end)
+        for year, week, _, _ in weeks:
+            events, scraped_at = self.store.load_week(year, week)
+            snapshot.write_week(year, week, events, scraped_at)
+        snapshot.write_manifest(weeks)
+        return snapshot.format, len(weeks)
+
+    def load_snapshot(self, path):
+        """Warm the store, cache and index from a snapshot so historical weeks never need a scrape
+
+        A week replaces the stored copy only if it was scraped later, and only
+        weeks scraped after they ended are cached; the rest still get re-scraped.
+        """
+        snapshot = WeekSnapshot(path)
+        stored = {(year, week): scraped_at for year, week, scraped_at, _ in self.store.weeks()} if self.store else {}
+        loaded = cached = 0
+        for year, week, partition in snapshot.partitions():
+            events, scraped_at = snapshot.read_week(partition)
+            if self.store and (stored.get((year, week)) or '') < (scraped_at or ''):
+                self.store.save_week(year, week, events, scraped_at)
+            year, week, url = self.resolve_week(year, week)
+            if events and week_settled(year, week, scraped_at, self.settle_margin):
+                self.cache_week(year, week, {
+                    'success': True,
+                    'events': events,
+                    'scraped_at': scraped_at,
+                    'source': url,
+                    'fetched_via': 'snapshot'
+                })
+                cached += 1
+            loaded += 1
+        return loaded, cached
+
+    def ingest_week(self, year, week, data):
+        """Publish a freshly scraped week: diff it into the change feed and persist it"""
+        year, week, url = self.resolve_week(year, week)
+        
+        if not self.changes.has_snapshot(year, week):
+            # Seed the diff baseline from what we served or stored before this scrape
+            previous = self.cache.peek(url)
+            if previous:
+                self.changes.seed(year, week, previous['events'])
+            elif self.store:
+                stored = self.store.load_week(year, week)
+                if stored:
+                    self.changes.seed(year, week, stored[0])
+        changed = self.changes.record(year, week, data['events'])
+        if changed:
+            print(f"{year}-W{week}: {changed} events changed")
+        
+        if self.store:
+            with metrics.span('store_save'):
+                saved = self.store.save_week(year, week, data['events'], data['scraped_at'])
+            print(f"Stored {year}-W{week}: {saved} events inserted or updated")
+
+    def fetch_week(self, year, week, max_retries=3):
+        """Scrape all events for one week, over plain HTTP first and Selenium as fallback"""
+        year, week, url = self.resolve_week(year, week)
+        
+        if self.http_fetcher:
+            events, problem = self.fetch_week_http(year, week)
+            if not problem:
+                return {
+                    'success': True,
+                    'events': events,
+                    'scraped_at': datetime.now().isoformat(),
+                    'source': url,
+                    'fetched_via': 'http'
+                }
+            print(f"HTTP fast path rejected ({problem}), falling back to Selenium")
+            metrics.inc('http_fast_path_fallbacks_total', reason=problem)
+        
+        return self.fetch_week_selenium(year, week, max_retries)
+
+    def fetch_week_http(self, year, week):
+        """Parse the server-rendered page without a browser
+
+        Returns (events, problem). The page is only accepted as the week when it
+        shows times in the Selenium path's timezone and its day blocks cover the
+        requested week; otherwise problem names why and events is empty.
+        """
+        page_source = self.http_fetcher.fetch(year, week)
+        if not page_source:
+            return [], 'fetch_failed'
+        print(f"HTTP page source length: {len(page_source)}")
+        try:
+            tree = lxml.html.fromstring(page_source)
+        except Exception as e:
+            print(f"Error parsing HTTP page: {str(e)}")
+            return [], 'unparseable'
+        
+        offset = page_timezone_offset(tree)
+        if offset != CALENDAR_TZ_OFFSET:
+            print(f"HTTP page timezone offset {offset} does not match {CALENDAR_TZ_OFFSET}")
+            return [], 'timezone'
+        
+        events = self.parse_calendar_data(tree, year, week)
+        if not covers_week(events, year, week):
+            return [], 'incomplete_week'
+        return events, None
+
+    def fetch_week_selenium(self, year, week, max_retries=3):
+        """Scrape all events for one week using Selenium"""
+        year, week, url = self.resolve_week(year, week)
         
         print(f"Scraping: {url}")
         
         for attempt in range(max_retries):
-            driver = None
+            pooled = None
+            discard = True
             try:
                 print(f"Attempt {attempt + 1}/{max_retries}")
+                if attempt > 0:
+                    metrics.inc('scrape_retries_total')
                 
-                # Initialize driver
-                driver = self.initialize_driver()
-                if not driver:
+                # Borrow a warm driver from the pool
+                with metrics.span('driver_checkout'):
+                    pooled = self.pool.checkout()
+                if not pooled:
+                    metrics.inc('scrape_attempts_total', outcome='no_driver')
                     continue
+                driver = pooled.driver
                 
                 # Load page
-                driver.get(url)
-                print(f"Page loaded, source length: {len(driver.page_source)}")
+                with metrics.span('page_load'):
+                    driver.get(url)
+                self.record_page_load(driver)
+                initial_length = len(driver.page_source)
+                print(f"Page loaded, source length: {initial_length}")
                 
                 # Check if page loaded properly
-                if len(driver.page_source) < 200:
+                if initial_length < 200:
                     print("Page source too short, retrying...")
+                    metrics.inc('scrape_attempts_total', outcome='short_page')
                     continue
                 
                 # Interact with site elements
@@ -149,127 +2228,121 @@ class BabyPipsSeleniumScraper:
                 page_source = driver.page_source
                 print(f"Final page source length: {len(page_source)}")
                 
-                # Parse with BeautifulSoup
-                soup = BeautifulSoup(page_source, 'html.parser')
-                events = self.parse_calendar_data(soup, year, week)
-                
-                # Apply filters
-                filtered_events = self.apply_filters(events, currency_filter, impact_filter)
+                # Parse with lxml
+                events = self.parse_calendar_data(page_source, year, week)
+                discard = False
+                metrics.inc('scrape_attempts_total', outcome='success')
                 
                 return {
                     'success': True,
-                    'total_events': len(filtered_events),
-                    'events': filtered_events,
-                    'filters_applied': {
-                        'year': year,
-                        'week': f'W{week}',
-                        'currency': currency_filter,
-                        'impact': impact_filter
-                    },
+                    'events': events,
                     'scraped_at': datetime.now().isoformat(),
-                    'source': url
+                    'source': url,
+                    'fetched_via': 'selenium'
                 }
                 
             except Exception as e:
                 print(f"Attempt {attempt + 1} failed: {str(e)}")
+                metrics.inc('scrape_attempts_total', outcome='error')
                 if attempt == max_retries - 1:
                     return {
                         'error': f'Failed to scrape after {max_retries} attempts',
                         'last_error': str(e)
                     }
             finally:
-                if driver:
-                    try:
-                        driver.quit()
-                    except:
-                        pass
+                if pooled:
+                    self.pool.checkin(pooled, discard=discard)
                         
         return {'error': 'Max retries exceeded'}
 
-    def parse_calendar_data(self, soup, year, week):
-        """Parse calendar data from BeautifulSoup object"""
-        events = []
+    def parse_calendar_data(self, page_source, year, week):
+        """Parse calendar data from page HTML (or an already parsed lxml tree)"""
+        with metrics.span('parse'):
+            events = list(self.iter_calendar_events(page_source, year, week))
+        print(f"Total events parsed: {len(events)}")
+        return events
+
+    def iter_calendar_events(self, page_source, year, week, scraped_at=None):
+        """Yield events one at a time as day blocks are walked; all share one scraped_at"""
+        scraped_at = scraped_at or datetime.now().isoformat()
         
         try:
-            # Look for calendar day blocks based on the GitHub example
-            blocks = soup.find_all('div', class_='Section-module__container___WUPgM Table-module__day___As54H')
-            print(f"Found {len(blocks)} calendar day blocks")
-            
-            if not blocks:
-                # Fallback: look for similar structures
-                blocks = soup.find_all('div', class_=re.compile(r'day', re.I)) or \
-                         soup.find_all('section', class_=re.compile(r'day', re.I))
-                print(f"Fallback: Found {len(blocks)} day-related blocks")
-            
-            for i, block in enumerate(blocks):
-                try:
-                    # Extract day information
-                    month_elem = block.find('div', class_='Table-module__month___PGbXI')
-                    day_elem = block.find('div', class_='Table-module__dayNumber___dyJpm')
-                    weekday_elem = block.find('td', class_='Table-module__weekday___p3Buh')
-                    
-                    if not month_elem or not day_elem:
-                        # Try alternative selectors
-                        month_elem = block.find(string=re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'))
-                        day_elem = block.find(string=re.compile(r'\d{1,2}'))
-                    
-                    month_name = month_elem.get_text() if hasattr(month_elem, 'get_text') else str(month_elem) if month_elem else 'Jan'
-                    day_number = day_elem.get_text() if hasattr(day_elem, 'get_text') else str(day_elem) if day_elem else '1'
-                    
-                    # Skip December dates in week 1 (previous year)
-                    if week == '01' and month_name == 'Dec':
-                        continue
-                    
-                    month_num = self.months.get(month_name, '01')
-                    
-                    # Find event rows in this day block
-                    event_rows = block.find_all('tr') if block.find('tbody') else []
-                    if block.find('tbody'):
-                        event_rows = block.find('tbody').find_all('tr')
-                    
-                    print(f"Day {day_number} {month_name}: Found {len(event_rows)} events")
-                    
-                    for row in event_rows:
-                        event = self.parse_event_row(row, year, month_num, day_number)
-                        if event:
-                            events.append(event)
-                            
-                except Exception as e:
-                    print(f"Error parsing day block {i}: {str(e)}")
-                    continue
-                    
+            tree = lxml.html.fromstring(page_source) if isinstance(page_source, (str, bytes)) else page_source
         except Exception as e:
             print(f"Error parsing calendar data: {str(e)}")
+            return
         
-        print(f"Total events parsed: {len(events)}")
-        return events
+        # Look for calendar day blocks based on the GitHub example
+        blocks = DAY_BLOCKS(tree)
+        print(f"Found {len(blocks)} calendar day blocks")
+        
+        if not blocks:
+            # Fallback: look for similar structures
+            blocks = FALLBACK_DAY_DIVS(tree) or FALLBACK_DAY_SECTIONS(tree)
+            print(f"Fallback: Found {len(blocks)} day-related blocks")
+            metrics.inc('fallback_selector_hits_total', kind='day_block')
+        
+        for i, block in enumerate(blocks):
+            try:
+                # Extract day information
+                month_elem = first_or_none(MONTH_CELL(block))
+                day_elem = first_or_none(DAY_NUMBER_CELL(block))
+                
+                if month_elem is not None and day_elem is not None:
+                    month_name = month_elem.text_content()
+                    day_number = day_elem.text_content()
+                else:
+                    # Try alternative selectors
+                    metrics.inc('fallback_selector_hits_total', kind='day_header')
+                    month_name = first_text_matching(block, MONTH_NAME_RE) or 'Jan'
+                    day_number = first_text_matching(block, DAY_NUMBER_RE) or '1'
+                
+                # Skip December dates in week 1 (previous year)
+                if week == '01' and month_name == 'Dec':
+                    continue
+                
+                month_num = self.months.get(month_name, '01')
+                
+                # Find event rows in this day block
+                event_rows = EVENT_ROWS(block)
+                
+                print(f"Day {day_number} {month_name}: Found {len(event_rows)} events")
+                
+            except Exception as e:
+                print(f"Error parsing day block {i}: {str(e)}")
+                continue
+            
+            parsed = 0
+            for row in event_rows:
+                event = self.parse_event_row(row, year, month_num, day_number, scraped_at)
+                if event:
+                    parsed += 1
+                    yield event
+            metrics.inc('events_parsed_total', parsed)
 
-    def parse_event_row(self, row, year, month_num, day_number):
-        """Parse individual event row"""
+    def parse_event_row(self, row, year, month_num, day_number, scraped_at=None):
+        """Parse individual event row, walking its cells once"""
         try:
-            # Extract event details using the CSS classes from GitHub example
-            time_elem = row.find('td', class_='Table-module__time___IHBtp')
-            currency_elem = row.find('td', class_='Table-module__currency___gSAJ5')
-            name_elem = row.find('td', class_='Table-module__name___FugPe')
-            impact_elem = row.find('td', class_='Table-module__impact___kYuei')
-            actual_elem = row.find('td', class_='Table-module__actual___kzVNq')
-            forecast_elem = row.find('td', class_='Table-module__forecast___WchYX')
-            previous_elem = row.find('td', class_='Table-module__previous___F0PHu')
+            # Map cells to fields by the CSS module class prefix from the GitHub example
+            cells = row.findall('td')
+            values = {}
+            for cell in cells:
+                for css_class in cell.get('class', '').split():
+                    field = CELL_FIELDS.get(css_class.split('___', 1)[0])
+                    if field and field not in values:
+                        values[field] = cell_text(cell)
+                        break
             
             # Fallback if specific classes not found
-            if not time_elem:
-                cells = row.find_all('td')
+            if 'time' not in values:
+                metrics.inc('fallback_selector_hits_total', kind='event_cells')
+                if len(cells) < 7:
+                    cells = row.xpath('.//td')
                 if len(cells) >= 7:
-                    time_elem, currency_elem, name_elem, impact_elem, actual_elem, forecast_elem, previous_elem = cells[:7]
+                    values = dict(zip(CELL_ORDER, (cell_text(cell) for cell in cells[:7])))
             
-            # Extract text values
-            time_val = time_elem.get_text(strip=True) if time_elem else ''
-            currency_val = currency_elem.get_text(strip=True) if currency_elem else ''
-            name_val = name_elem.get_text(strip=True) if name_elem else ''
-            impact_val = impact_elem.get_text(strip=True) if impact_elem else ''
-            actual_val = actual_elem.get_text(strip=True) if actual_elem else ''
-            forecast_val = forecast_elem.get_text(strip=True) if forecast_elem else ''
-            previous_val = previous_elem.get_text(strip=True) if previous_elem else ''
+            name_val = values.get('name', '')
+            time_val = values.get('time', '')
             
             # Skip empty rows
             if not name_val or len(name_val) < 3:
@@ -281,14 +2354,14 @@ class BabyPipsSeleniumScraper:
             return {
                 'date': f"{year}-{month_num}-{day_number.zfill(2)}",
                 'time': time_val,
-                'currency': currency_val,
+                'currency': values.get('currency', ''),
                 'event_name': name_val,
-                'importance': self.normalize_impact(impact_val),
-                'actual': actual_val,
-                'forecast': forecast_val,
-                'previous': previous_val,
+                'importance': self.normalize_impact(values.get('impact', '')),
+                'actual': values.get('actual', ''),
+                'forecast': values.get('forecast', ''),
+                'previous': values.get('previous', ''),
                 'timestamp': timestamp,
-                'scraped_at': datetime.now().isoformat()
+                'scraped_at': scraped_at or datetime.now().isoformat()
             }
             
         except Exception as e:
@@ -323,6 +2396,9 @@ class BabyPipsSeleniumScraper:
 
     def apply_filters(self, events, currency_filter, impact_filter):
         """Apply filters to events"""
+        if isinstance(events, EventBatch):
+            return events.to_dicts(events.select(currency_filter, impact_filter))
+        
         filtered_events = events
         
         if currency_filter:
@@ -341,9 +2417,176 @@ class BabyPipsSeleniumScraper:
         
         return filtered_events
 
+def saturated_response(error):
+    """503 with Retry-After for requests rejected by scrape admission control"""
+    response = jsonify({
+        'error': 'Scraper is at capacity',
+        'retry_after': error.retry_after
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+def parse_time_bound(value):
+    """Epoch seconds from an epoch number, ISO date or ISO datetime; None if value is empty"""
+    if not value:
+        return None
+    if value.lstrip('-').isdigit():
+        return int(value)
+    return int(datetime.fromisoformat(value).timestamp())
+
+SSE_HEARTBEAT_SECONDS = 15
+
+# Each SSE stream holds a server thread for its lifetime, so cap them below WEB_THREADS
+SSE_MAX_STREAMS = int(os.environ.get('SSE_MAX_STREAMS', '8'))
+sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
+def filter_changes(changes, currency_filter, impact_filter):
+    """Apply the /calendar currency and impact filters to change records"""
+    if not currency_filter and not impact_filter:
+        return changes
+    return [
+        change for change in changes
+        if scraper.apply_filters([change['event']], currency_filter, impact_filter)
+    ]
+
+RESPONSE_FORMATS = ('json', 'ndjson')
+NDJSON_BATCH_SIZE = 500
+
+def ndjson_response(batches, headers=None):
+    """Stream batches of records as newline-delimited JSON, gzipped when the client accepts it
+
+    Each batch is flushed to the client as soon as it is encoded, so the first
+    events go out before later batches are produced.
+    """
+    use_gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    
+    def generate():
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+        for batch in batches:
+            if not batch:
+                continue
+            chunk = ''.join(json.dumps(record) + '\n' for record in batch).encode()
+            if compressor:
+                chunk = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            yield chunk
+        if compressor:
+            yield compressor.flush()
+    
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    response.headers['Vary'] = 'Accept-Encoding'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    for name, value in (headers or {}).items():
+        response.headers[name] = value
+    return response
+
+RANGE_MAX_WEEKS = int(os.environ.get('RANGE_MAX_WEEKS', '104'))
+
+# A range request holds a server thread until its last week is written, so only a few run at once
+RANGE_MAX_CONCURRENT = int(os.environ.get('RANGE_MAX_CONCURRENT', '2'))
+range_slots = threading.BoundedSemaphore(RANGE_MAX_CONCURRENT)
+
+def range_response(start, end, start_spec, end_spec, weeks, currency_filter, impact_filter, response_format):
+    """Streaming /calendar/range response in the requested format"""
+    if response_format == 'ndjson':
+        def week_batches():
+            # One batch per week so each week is flushed as soon as it is ready
+            for result in scraper.scrape_range(start, end, currency_filter, impact_filter):
+                if 'error' in result:
+                    yield [result]
+                else:
+                    yield result['events']
+        
+        return ndjson_response(week_batches())
+    
+    def generate():
+        failed_weeks = []
+        total_events = 0
+        yield '{"success": true, "from": %s, "to": %s, "weeks": [' % (json.dumps(start_spec), json.dumps(end_spec))
+        for i, result in enumerate(scraper.scrape_range(start, end, currency_filter, impact_filter)):
+            if 'error' in result:
+                failed_weeks.append(result['week'])
+            else:
+                total_events += result['total_events']
+            yield (',' if i else '') + json.dumps(result)
+        yield '], "total_weeks": %d, "total_events": %d, "failed_weeks": %s}' % (
+            len(weeks), total_events, json.dumps(failed_weeks))
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
 # Initialize scraper
 scraper = BabyPipsSeleniumScraper()
 
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', '')
+if SNAPSHOT_DIR and os.path.isdir(SNAPSHOT_DIR):
+    started = time.perf_counter()
+    try:
+        loaded, cached = scraper.load_snapshot(SNAPSHOT_DIR)
+        print(f"Loaded {loaded} weeks from snapshot {SNAPSHOT_DIR} ({cached} cached) "
+              f"in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        print(f"Error loading snapshot {SNAPSHOT_DIR}: {str(e)}")
+
+prewarmer = PrewarmScheduler(
+    scraper,
+    current_interval=int(os.environ.get('PREWARM_CURRENT_INTERVAL', '300')),
+    window_interval=int(os.environ.get('PREWARM_WINDOW_INTERVAL', '3600')),
+    release_interval=int(os.environ.get('PREWARM_RELEASE_INTERVAL', '60')),
+    release_window=int(os.environ.get('PREWARM_RELEASE_WINDOW', '900')),
+    jitter=float(os.environ.get('PREWARM_JITTER', '0.1')),
+    max_concurrent=int(os.environ.get('PREWARM_CONCURRENCY', '1'))
+)
+if os.environ.get('PREWARM_ENABLED', '0') == '1':
+    prewarmer.start()
+    atexit.register(prewarmer.stop)
+
+release_watcher = ReleaseWatcher(
+    scraper,
+    lead=int(os.environ.get('RELEASE_WATCH_LEAD', '120')),
+    linger=int(os.environ.get('RELEASE_WATCH_LINGER', '600')),
+    poll_interval=float(os.environ.get('RELEASE_WATCH_POLL_INTERVAL', '0.5')),
+    reload_interval=int(os.environ.get('RELEASE_WATCH_RELOAD_INTERVAL', '15'))
+)
+if os.environ.get('RELEASE_WATCH_ENABLED', '0') == '1':
+    release_watcher.start()
+    atexit.register(release_watcher.stop)
+
+metrics.describe('chrome_rss_bytes', 'gauge', 'Resident memory of all pooled Chrome process trees')
+metrics.gauge('chrome_rss_bytes', scraper.pool.rss)
+metrics.describe('driver_pool_drivers', 'gauge', 'Pooled drivers by state')
+metrics.gauge('driver_pool_drivers', lambda: {
+    (('state', state),): count for state, count in scraper.pool.stats().items() if state in ('idle', 'in_use')
+})
+metrics.describe('cache_weeks', 'gauge', 'Weeks held in the result cache')
+metrics.gauge('cache_weeks', lambda: scraper.cache.stats()['weeks'])
+metrics.describe('cache_events', 'gauge', 'Events held in the result cache')
+metrics.gauge('cache_events', lambda: scraper.cache.stats()['events'])
+metrics.describe('scrapes_in_flight', 'gauge', 'Week scrapes currently running')
+metrics.gauge('scrapes_in_flight', scraper.flights.in_flight)
+metrics.describe('scrape_executor_tasks', 'gauge', 'Admitted scrapes by state')
+metrics.gauge('scrape_executor_tasks', lambda: {
+    (('state', state),): count for state, count in scraper.scrape_executor.stats().items() if state in ('running', 'queued')
+})
+metrics.describe('scrape_waiters', 'gauge', 'Requests waiting on a scrape of the same week')
+metrics.gauge('scrape_waiters', scraper.flights.waiting)
+metrics.describe('scrapes_coalesced_total', 'counter', 'Requests that joined an in-flight scrape of the same week')
+metrics.gauge('scrapes_coalesced_total', lambda: scraper.flights.coalesced)
+
+@app.before_request
+def start_request_timer():
+    request.environ['metrics.start'] = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    start = request.environ.get('metrics.start')
+    if start is not None:
+        metrics.observe(
+            'http_request_duration_seconds', time.perf_counter() - start,
+            endpoint=request.endpoint or 'unknown', status=str(response.status_code)
+        )
+    return response
+
 @app.route('/')
 def home():
     """API documentation"""
@@ -355,7 +2598,14 @@ def home():
             '/calendar?year=2025&week=32': 'GET - Scrape specific week',
             '/calendar?currency=USD,EUR': 'GET - Filter by currencies',
             '/calendar?impact=high,medium': 'GET - Filter by impact level',
+            '/calendar/range?from=2025-W01&to=2025-W26': 'GET - Scrape a range of weeks (streamed)',
+            '/calendar?from=2025-01-01&to=2025-03-31': 'GET - Query stored events by date range',
+            '/calendar?format=ndjson': 'GET - Stream events as newline-delimited JSON (gzip with Accept-Encoding)',
+            '/calendar/changes?since=0': 'GET - Events whose actual/forecast/previous changed since a cursor',
+            '/calendar/changes/stream': 'GET - Server-Sent Events stream of calendar changes',
+            '/events?currency=USD,EUR&impact=high&from=2025-08-04&to=2025-08-06': 'GET - Query all loaded weeks from the in-memory index',
             '/weeks': 'GET - Get available weeks',
+            '/metrics': 'GET - Prometheus metrics',
             '/health': 'GET - Health check'
         },
         'note': 'This version uses Selenium WebDriver and requires Chrome/Chromium installed',
@@ -363,7 +2613,8 @@ def home():
             '/calendar',
             '/calendar?year=2025&week=32',
             '/calendar?currency=USD,EUR&impact=high',
-            '/calendar?year=2025&week=32&currency=USD&impact=high'
+            '/calendar?year=2025&week=32&currency=USD&impact=high',
+            '/calendar/range?from=2025-W01&to=2025-W26&currency=USD&impact=high'
         ]
     })
 
@@ -377,19 +2628,72 @@ def get_calendar():
         currency_filter = request.args.get('currency')
         impact_filter = request.args.get('impact')
         
+        start_date = request.args.get('from')
+        end_date = request.args.get('to')
+        response_format = request.args.get('format', 'json')
+        
         # Validate parameters
+        if response_format not in RESPONSE_FORMATS:
+            return jsonify({'error': 'Format must be json or ndjson'}), 400
+        
         if year and not year.isdigit():
             return jsonify({'error': 'Year must be a number'}), 400
         
         if week and (not week.isdigit() or int(week) < 1 or int(week) > 53):
             return jsonify({'error': 'Week must be a number between 1 and 53'}), 400
         
+        # Date ranges are answered from the local event store without scraping
+        if start_date or end_date:
+            if not scraper.store:
+                return jsonify({'error': 'Event store is disabled'}), 400
+            try:
+                start_ts = int(datetime.strptime(start_date, '%Y-%m-%d').timestamp()) if start_date else None
+                end_ts = int((datetime.strptime(end_date, '%Y-%m-%d') + timedelta(days=1)).timestamp()) if end_date else None
+            except ValueError:
+                return jsonify({'error': 'from and to must be dates in YYYY-MM-DD format'}), 400
+            
+            currencies = [c.strip() for c in currency_filter.split(',')] if currency_filter else None
+            impacts = [i.strip() for i in impact_filter.split(',')] if impact_filter else None
+            if response_format == 'ndjson':
+                return ndjson_response(
+                    scraper.store.iter_query(start_ts, end_ts, currencies, impacts),
+                    {'X-Source': 'store'}
+                )
+            events = scraper.store.query(start_ts, end_ts, currencies, impacts)
+            return jsonify({
+                'success': True,
+                'total_events': len(events),
+                'events': events,
+                'filters_applied': {
+                    'from': start_date,
+                    'to': end_date,
+                    'currency': currency_filter,
+                    'impact': impact_filter
+                },
+                'source': 'store'
+            })
+        
         # Scrape data
-        result = scraper.scrape_calendar(year, week, currency_filter, impact_filter)
+        try:
+            result = scraper.scrape_calendar(year, week, currency_filter, impact_filter)
+        except ScrapeQueueFull as e:
+            return saturated_response(e)
         
         if 'error' in result:
             return jsonify(result), 500
         
+        if response_format == 'ndjson':
+            events = result['events']
+            return ndjson_response(
+                (events[i:i + NDJSON_BATCH_SIZE] for i in range(0, len(events), NDJSON_BATCH_SIZE)),
+                {
+                    'X-Source': result['source'],
+                    'X-Scraped-At': result['scraped_at'],
+                    'X-Cache': result['cache'],
+                    'X-Total-Events': str(result['total_events'])
+                }
+            )
+        
         return jsonify(result)
         
     except Exception as e:
@@ -398,6 +2702,163 @@ def get_calendar():
             'message': str(e)
         }), 500
 
+@app.route('/calendar/range')
+def get_calendar_range():
+    """Scrape a range of weeks, streaming each week's result in week order"""
+    try:
+        start_spec = request.args.get('from')
+        end_spec = request.args.get('to')
+        currency_filter = request.args.get('currency')
+        impact_filter = request.args.get('impact')
+        response_format = request.args.get('format', 'json')
+        
+        # Validate parameters
+        if response_format not in RESPONSE_FORMATS:
+            return jsonify({'error': 'Format must be json or ndjson'}), 400
+        
+        if not start_spec or not end_spec:
+            return jsonify({'error': 'Both from and to are required, e.g. from=2025-W01&to=2025-W26'}), 400
+        
+        try:
+            start = parse_week_spec(start_spec)
+            end = parse_week_spec(end_spec)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        weeks = iter_weeks(start, end)
+        if not weeks:
+            return jsonify({'error': 'from must not be after to'}), 400
+        if len(weeks) > RANGE_MAX_WEEKS:
+            return jsonify({'error': f'Range may span at most {RANGE_MAX_WEEKS} weeks'}), 400
+        
+        if not range_slots.acquire(blocking=False):
+            return saturated_response(ScrapeQueueFull(scraper.scrape_executor.retry_after()))
+        try:
+            response = range_response(start, end, start_spec, end_spec, weeks, currency_filter, impact_filter,
+                                      response_format)
+        except BaseException:
+            range_slots.release()
+            raise
+        response.call_on_close(range_slots.release)
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
+@app.route('/calendar/changes')
+def get_calendar_changes():
+    """Events whose actual/forecast/previous changed since a cursor"""
+    try:
+        since = request.args.get('since', '0')
+        limit = request.args.get('limit', '1000')
+        currency_filter = request.args.get('currency')
+        impact_filter = request.args.get('impact')
+        
+        # Validate parameters
+        if not since.isdigit():
+            return jsonify({'error': 'since must be a cursor returned by a previous call'}), 400
+        
+        if not limit.isdigit() or int(limit) < 1:
+            return jsonify({'error': 'limit must be a positive number'}), 400
+        
+        changes, next_cursor, truncated = scraper.changes.since(int(since), int(limit))
+        changes = filter_changes(changes, currency_filter, impact_filter)
+        
+        return jsonify({
+            'success': True,
+            'changes': changes,
+            'total_changes': len(changes),
+            'next_cursor': next_cursor,
+            'truncated': truncated
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
+@app.route('/calendar/changes/stream')
+def stream_calendar_changes():
+    """Server-Sent Events stream of calendar changes"""
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    currency_filter = request.args.get('currency')
+    impact_filter = request.args.get('impact')
+    
+    if since is not None and not since.isdigit():
+        return jsonify({'error': 'since must be a cursor returned by a previous call'}), 400
+    
+    if not sse_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Too many change streams open', 'retry_after': SSE_HEARTBEAT_SECONDS})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(SSE_HEARTBEAT_SECONDS)
+        return response
+    
+    # Without a cursor, start from now rather than replaying the buffer
+    cursor = int(since) if since is not None else scraper.changes.latest_cursor()
+    
+    def generate():
+        nonlocal cursor
+        yield 'retry: 3000\n\n'
+        while True:
+            if not scraper.changes.wait(cursor, SSE_HEARTBEAT_SECONDS):
+                yield ': heartbeat\n\n'
+                continue
+            changes, cursor, _ = scraper.changes.since(cursor)
+            for change in filter_changes(changes, currency_filter, impact_filter):
+                yield f"id: {change['cursor']}\nevent: change\ndata: {json.dumps(change)}\n\n"
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    response.call_on_close(sse_slots.release)
+    return response
+
+@app.route('/events')
+def get_events():
+    """Cross-week event query answered from the in-memory index"""
+    try:
+        currency_filter = request.args.get('currency')
+        impact_filter = request.args.get('impact')
+        start = request.args.get('from')
+        end = request.args.get('to')
+        limit = request.args.get('limit')
+        
+        # Validate parameters
+        try:
+            start_ts = parse_time_bound(start)
+            end_ts = parse_time_bound(end)
+        except ValueError:
+            return jsonify({'error': 'from and to must be epoch seconds or ISO dates/datetimes'}), 400
+        
+        if limit and (not limit.isdigit() or int(limit) < 1):
+            return jsonify({'error': 'limit must be a positive number'}), 400
+        
+        events = scraper.index.query(currency_filter, impact_filter, start_ts, end_ts, int(limit) if limit else None)
+        
+        return jsonify({
+            'success': True,
+            'total_events': len(events),
+            'events': events,
+            'filters_applied': {
+                'currency': currency_filter,
+                'impact': impact_filter,
+                'from': start_ts,
+                'to': end_ts
+            },
+            'indexed_weeks': scraper.index.stats()['weeks'],
+            'source': 'index'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'error': 'Internal server error',
+            'message': str(e)
+        }), 500
+
 @app.route('/weeks')
 def get_available_weeks():
     """Get list of available weeks"""
@@ -405,11 +2866,7 @@ def get_available_weeks():
         current_date = datetime.now()
         weeks = []
         
-        for i in range(-2, 5):
-            target_date = current_date + timedelta(weeks=i)
-            year, week_num, _ = target_date.isocalendar()
-            
-            monday = target_date - timedelta(days=target_date.weekday())
+        for offset, year, week_num, monday in week_window(current_date):
             friday = monday + timedelta(days=4)
             
             weeks.append({
@@ -418,7 +2875,7 @@ def get_available_weeks():
                 'display': f"Week {week_num}, {year}",
                 'date_range': f"{monday.strftime('%b %d')} - {friday.strftime('%b %d, %Y')}",
                 'url': f"/calendar?year={year}&week={week_num}",
-                'is_current': i == 0
+                'is_current': offset == 0
             })
         
         return jsonify({
@@ -433,20 +2890,37 @@ def get_available_weeks():
             'message': str(e)
         }), 500
 
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus metrics endpoint"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
     try:
-        # Test webdriver initialization
-        driver = scraper.initialize_driver()
-        driver_status = 'working' if driver else 'failed'
-        if driver:
-            driver.quit()
+        # Report pool state instead of launching a browser
+        pool_stats = scraper.pool.stats()
+        if pool_stats['last_error']:
+            driver_status = 'failed'
+        elif pool_stats['created'] == 0:
+            driver_status = 'not_started'
+        else:
+            driver_status = 'working'
         
         return jsonify({
             'status': 'healthy',
             'timestamp': datetime.now().isoformat(),
             'webdriver_status': driver_status,
+            'driver_pool': pool_stats,
+            'cache': scraper.cache.stats(),
+            'scrapes_in_flight': scraper.flights.in_flight(),
+            'scrape_waiters': scraper.flights.waiting(),
+            'scrape_executor': scraper.scrape_executor.stats(),
+            'event_store': scraper.store.stats() if scraper.store else None,
+            'event_index': scraper.index.stats(),
+            'prewarm': prewarmer.stats(),
+            'release_watch': release_watcher.stats(),
             'scraper_version': '3.0.0',
             'requirements': ['Chrome/Chromium browser', 'ChromeDriver']
         })
@@ -458,7 +2932,23 @@ def health_check():
             'requirements': ['Chrome/Chromium browser', 'ChromeDriver']
         }), 500
 
+def export_cli(argv):
+    """python main.py export --output DIR [--format parquet|msgpack|json] [--from 2024-W01] [--to 2025-W10]"""
+    parser = argparse.ArgumentParser(prog='main.py export', description='Export stored weeks to a partitioned snapshot')
+    parser.add_argument('--output', required=True, help='snapshot directory (year=YYYY/week=WW partitions)')
+    parser.add_argument('--format', choices=sorted(WeekSnapshot.FILENAMES), default=WeekSnapshot.default_format())
+    parser.add_argument('--from', dest='start', type=parse_week_spec, help='first ISO week, e.g. 2024-W01')
+    parser.add_argument('--to', dest='end', type=parse_week_spec, help='last ISO week, e.g. 2025-W10')
+    args = parser.parse_args(argv)
+    started = time.perf_counter()
+    fmt, count = scraper.export_snapshot(args.output, args.format, args.start, args.end)
+    print(f"Exported {count} weeks as {fmt} to {args.output} in {time.perf_counter() - started:.2f}s")
+
 if __name__ == '__main__':
+    if sys.argv[1:2] == ['export']:
+        export_cli(sys.argv[2:])
+        sys.exit(0)
+    
     print("=" * 70)
     print("BabyPips Economic Calendar Scraper v3.0 - Selenium Version")
     print("=" * 70)
@@ -476,6 +2966,8 @@ if __name__ == '__main__':
     print("Example URLs:")
     print("   http://localhost:5000/calendar")
     print("   http://localhost:5000/calendar?year=2025&week=32&currency=USD")
+    print()
+    print("Development server only; in production run: gunicorn -c gunicorn.conf.py main:app")
     print("=" * 70)
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=os.environ.get('FLASK_DEBUG', '0') == '1', host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file